@@ -1,28 +1,83 @@
 """Refactored broker data deletion automation script using services."""
 import argparse
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from playwright.sync_api import sync_playwright
+from typing import Callable, Optional
 from dotenv import load_dotenv
 
-from services.broker_processor import BrokerProcessor, BrokerConfigurationError
+from services.broker_processor import (BrokerProcessor,
+                                       BrokerConfigurationError,
+                                       BUCKET_DETERMINISTIC_WEB,
+                                       BUCKET_DETERMINISTIC_EMAIL,
+                                       BUCKET_AI_FALLBACK, BUCKET_INVALID)
 from services.form_handler import FormHandler, FormSubmissionError
-from services.ai_fallback_service import AIFallbackService, AIFallbackError
-from utils import (create_browser_context, take_screenshot, prepare_user_data,
-                   validate_date_of_birth, validate_state_input)
+from services.ai_fallback_service import (AIFallbackService, AIFallbackError,
+                                          CONFIRM_MODES,
+                                          DEFAULT_AUTO_CONFIRM_THRESHOLD)
+from utils import (BrowserSession, take_screenshot, navigate_to_form,
+                   set_screenshots_enabled, prepare_user_data,
+                   validate_date_of_birth, validate_state_input,
+                   get_broker_logger, buffered_broker_output)
+from utils.browser import NON_ESSENTIAL_RESOURCE_TYPES
 
 # Load environment variables
 load_dotenv()
 
+# Default number of brokers processed in parallel
+DEFAULT_CONCURRENCY = 3
+
+# Default number of AI fallback brokers processed in parallel; each one drives
+# a browser through the whole form and waits on the LLM and the user
+DEFAULT_AI_CONCURRENCY = 2
+
+# User arguments that control the run rather than describe the user
+RUN_OPTION_ARGS = frozenset({'broker_filter'})
+
+logger = get_broker_logger()
+
 
 class DataDeletionOrchestrator:
     """Orchestrates the entire data deletion workflow."""
 
-    def __init__(self):
-        """Initialize with service dependencies."""
+    def __init__(self,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 ai_concurrency: int = DEFAULT_AI_CONCURRENCY,
+                 confirm_mode: str = 'interactive',
+                 auto_confirm_threshold: int = DEFAULT_AUTO_CONFIRM_THRESHOLD,
+                 headless: Optional[bool] = None):
+        """Initialize with service dependencies.
+
+        Args:
+            concurrency: Maximum number of deterministic brokers processed
+                in parallel
+            ai_concurrency: Maximum number of AI fallback brokers processed
+                in parallel
+            confirm_mode: How AI-filled forms are confirmed before submission
+            auto_confirm_threshold: Filled fields needed to submit in auto mode
+            headless: Whether worker browsers run without a window; by
+                default only AI fallback brokers reviewed interactively
+                get one
+
+        Raises:
+            ValueError: If OPENAI_API_KEY is not set
+        """
+        # Check once at startup rather than partway through a run
+        if not os.getenv("OPENAI_API_KEY"):
+            raise ValueError("Please set OPENAI_API_KEY environment variable")
+
         self.broker_processor = BrokerProcessor()
         self.form_handler = FormHandler()
-        self.ai_fallback = AIFallbackService()
+        self.ai_fallback = AIFallbackService(
+            confirm_mode=confirm_mode,
+            auto_confirm_threshold=auto_confirm_threshold)
+        self.concurrency = max(1, concurrency)
+        self.ai_concurrency = max(1, ai_concurrency)
+        self.headless = headless
+        self.confirm_mode = confirm_mode
+        # (config, submission_time) pairs awaiting a confirmation email check
+        self._pending_confirmations = []
 
     def run_deletion_workflow(self, user_args: dict) -> dict:
         """Run the complete data deletion workflow.
@@ -33,38 +88,64 @@ class DataDeletionOrchestrator:
         Returns:
             Summary dictionary with processing results
         """
-        if not os.getenv("OPENAI_API_KEY"):
-            raise ValueError("Please set OPENAI_API_KEY environment variable")
-
         try:
             # Load and filter configurations
             configs = self.broker_processor.get_all_configurations()
             configs = self.broker_processor.filter_configurations(
                 configs, user_args.get('broker_filter'))
 
-            print(f"\n=== Processing {len(configs)} broker(s) ===")
+            logger.info(f"\n=== Processing {len(configs)} broker(s) ===")
 
             successful_deletions = []
             failed_deletions = []
+            self._pending_confirmations = []
+
+            # Sort brokers by approach up front so the browser-heavy AI
+            # fallback brokers get their own, smaller worker limit
+            buckets = self.broker_processor.classify(configs)
+            for config in buckets[BUCKET_INVALID]:
+                logger.info(f"Skipping {config['name']}: no URL or "
+                            "supported broker type configured")
+            deterministic_brokers = (
+                [(self._handle_web_form_workflow, config)
+                 for config in buckets[BUCKET_DETERMINISTIC_WEB]] +
+                [(self._handle_email_workflow, config)
+                 for config in buckets[BUCKET_DETERMINISTIC_EMAIL]])
+            ai_brokers = [(self._handle_ai_workflow, config)
+                          for config in buckets[BUCKET_AI_FALLBACK]]
+
+            # Process brokers in parallel; each broker is dominated by page
+            # loads, form submissions and email polling rather than CPU work
+            results = {}
+            deterministic_workers = min(self.concurrency,
+                                        len(deterministic_brokers))
+            ai_workers = min(self.ai_concurrency, len(ai_brokers))
+            max_workers = (deterministic_workers + ai_workers) or 1
+            # Deterministic forms are submitted through their APIs, so only
+            # interactive AI review needs a window to look at
+            deterministic_headless = self._is_headless(False)
+            ai_headless = self._is_headless(self.confirm_mode == 'interactive')
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                workers = self._start_workers(executor, deterministic_brokers,
+                                              deterministic_workers, user_args,
+                                              results, deterministic_headless)
+                workers += self._start_workers(executor, ai_brokers,
+                                               ai_workers, user_args, results,
+                                               ai_headless)
+            for worker in workers:
+                worker.result()
 
-            # Process each broker
             for config in configs:
-                broker_name = config.get('name', 'Unknown')
-                print(f"\n{'='*60}")
-                print(f"Processing: {broker_name}")
-                print(f"{'='*60}")
-
-                try:
-                    success = self._process_single_broker(config, user_args)
-                    if success:
-                        successful_deletions.append(broker_name)
-                    else:
-                        failed_deletions.append(broker_name)
-
-                except Exception as e:
-                    print(f"❌ Error processing {broker_name}: {str(e)}")
+                broker_name = config['name']
+                if results.get(broker_name, False):
+                    successful_deletions.append(broker_name)
+                else:
                     failed_deletions.append(broker_name)
 
+            # Check confirmation emails for every submitted form in one pass
+            if self._pending_confirmations:
+                self._check_confirmations(user_args['email'])
+
             # Generate and display summary
             summary = self.broker_processor.get_processing_summary(
                 successful_deletions, failed_deletions)
@@ -73,191 +154,281 @@ class DataDeletionOrchestrator:
             return summary
 
         except BrokerConfigurationError as e:
-            print(f"❌ Configuration Error: {str(e)}")
+            logger.info(f"❌ Configuration Error: {str(e)}")
             if e.recovery_suggestions:
-                print("Recovery suggestions:")
+                logger.info("Recovery suggestions:")
                 for suggestion in e.recovery_suggestions:
-                    print(f"  - {suggestion}")
+                    logger.info(f"  - {suggestion}")
             return {"error": str(e)}
 
-    def _process_single_broker(self, config: dict, user_args: dict) -> bool:
-        """Process a single broker configuration.
-        
+    def _is_headless(self, reviewed_in_browser: bool) -> bool:
+        """Decide whether a group of workers runs browsers without a window.
+
+        Args:
+            reviewed_in_browser: Whether someone looks at the filled form
+                in the browser window before it is submitted
+
+        Returns:
+            The headless setting passed at init, if any, otherwise True
+            unless the window is needed for review
+        """
+        if self.headless is not None:
+            return self.headless
+        return not reviewed_in_browser
+
+    def _start_workers(self, executor: ThreadPoolExecutor, brokers: list,
+                       worker_count: int, user_args: dict, results: dict,
+                       headless: bool) -> list:
+        """Start workers that share one queue of brokers.
+
         Args:
+            executor: Executor to run the workers on
+            brokers: (handler, config) pairs to process
+            worker_count: Number of workers to start
+            user_args: User arguments dictionary
+            results: Broker name to success flag, filled in by the workers
+            headless: Whether the workers' browsers run without a window
+
+        Returns:
+            Futures of the started workers
+        """
+        broker_queue = queue.Queue()
+        for broker in brokers:
+            broker_queue.put(broker)
+
+        return [
+            executor.submit(self._broker_worker, broker_queue, user_args,
+                            results, headless) for _ in range(worker_count)
+        ]
+
+    def _broker_worker(self, broker_queue: queue.Queue, user_args: dict,
+                       results: dict, headless: bool):
+        """Process queued brokers on one thread with a shared browser.
+
+        Args:
+            broker_queue: Queue of (handler, config) pairs to process
+            user_args: User arguments dictionary
+            results: Broker name to success flag, filled in by the workers
+            headless: Whether the browser runs without a window
+        """
+        with BrowserSession(headless=headless) as browser_session:
+            while True:
+                try:
+                    handler, config = broker_queue.get_nowait()
+                except queue.Empty:
+                    return
+                results[config['name']] = self._run_broker(
+                    handler, config, user_args, browser_session)
+
+    def _run_broker(self, handler: Callable, config: dict, user_args: dict,
+                    browser_session: BrowserSession) -> bool:
+        """Process a single broker on a worker thread, containing any errors.
+
+        Args:
+            handler: Workflow method for the broker's bucket
             config: Broker configuration dictionary
             user_args: User arguments dictionary
-            
+            browser_session: Browser shared by this worker's brokers
+
         Returns:
             True if processing successful, False otherwise
         """
-        broker_name = config.get('name', 'Unknown')
+        broker_name = config['name']
+        broker_logger = get_broker_logger(broker_name)
 
-        # Determine processing approach
-        use_ai_fallback = self.broker_processor.is_minimal_configuration(
-            config)
+        # Buffer this broker's output so it prints as one contiguous block
+        with buffered_broker_output():
+            broker_logger.info("\n%s\nProcessing: %s\n%s", '=' * 60,
+                               broker_name, '=' * 60)
 
-        if use_ai_fallback:
-            return self._handle_ai_workflow(config, user_args)
-        else:
-            return self._handle_deterministic_workflow(config, user_args)
+            try:
+                return handler(config, user_args, browser_session)
+            except Exception as e:
+                broker_logger.info(
+                    f"❌ Error processing {broker_name}: {str(e)}")
+                return False
+
+    def _handle_web_form_workflow(self, config: dict, user_args: dict,
+                                  browser_session: BrowserSession) -> bool:
+        """Handle deterministic workflow for a full web form configuration.
 
-    def _handle_deterministic_workflow(self, config: dict,
-                                       user_args: dict) -> bool:
-        """Handle deterministic workflow with full broker configuration.
-        
         Args:
             config: Full broker configuration
             user_args: User arguments dictionary
-            
+            browser_session: Browser shared by this worker's brokers
+
         Returns:
             True if successful, False otherwise
         """
-        broker_name = config.get('name', 'Unknown')
-        print(f"✓ Using deterministic config for {broker_name}")
-
-        # Prepare formatted user data
-        user_data = prepare_user_data(
-            config,
-            first_name=user_args['first_name'],
-            last_name=user_args['last_name'],
-            email=user_args['email'],
-            date_of_birth=user_args.get('date_of_birth'),
-            address=user_args.get('address'),
-            city=user_args.get('city'),
-            state=user_args.get('state'),
-            zip_code=user_args.get('zip_code'))
-
-        if config['type'] == 'web_form':
-            return self._handle_web_form(config, user_data)
-        elif config['type'] == 'email_only':
-            return self._handle_email_request(config, user_data)
-        else:
-            print(f"Unknown broker type: {config['type']}")
-            return False
+        user_data = self._prepare_deterministic_user_data(config, user_args)
+        return self._handle_web_form(config, user_data, browser_session)
+
+    def _handle_email_workflow(self, config: dict, user_args: dict,
+                               browser_session: BrowserSession) -> bool:
+        """Handle deterministic workflow for an email-only configuration.
+
+        Args:
+            config: Full broker configuration
+            user_args: User arguments dictionary
+            browser_session: Unused; email requests need no browser
+
+        Returns:
+            True if successful, False otherwise
+        """
+        user_data = self._prepare_deterministic_user_data(config, user_args)
+        return self._handle_email_request(config, user_data)
+
+    def _prepare_deterministic_user_data(self, config: dict,
+                                         user_args: dict) -> dict:
+        """Format user data for a full broker configuration.
+
+        Args:
+            config: Full broker configuration
+            user_args: User arguments dictionary
 
-    def _handle_ai_workflow(self, config: dict, user_args: dict) -> bool:
+        Returns:
+            User data formatted as the broker expects
+        """
+        logger.info(f"✓ Using deterministic config for {config['name']}")
+
+        return prepare_user_data(config,
+                                 first_name=user_args['first_name'],
+                                 last_name=user_args['last_name'],
+                                 email=user_args['email'],
+                                 date_of_birth=user_args.get('date_of_birth'),
+                                 address=user_args.get('address'),
+                                 city=user_args.get('city'),
+                                 state=user_args.get('state'),
+                                 zip_code=user_args.get('zip_code'))
+
+    def _handle_ai_workflow(self, config: dict, user_args: dict,
+                            browser_session: BrowserSession) -> bool:
         """Handle AI fallback workflow for minimal configurations.
         
         Args:
             config: Minimal broker configuration
             user_args: User arguments dictionary
+            browser_session: Browser shared by this worker's brokers
             
         Returns:
             True if successful, False otherwise
         """
-        broker_name = config.get('name', 'Unknown')
-        print(f"🤖 Using AI fallback for {broker_name} (minimal config)")
+        broker_name = config['name']
+        logger.info(f"🤖 Using AI fallback for {broker_name} (minimal config)")
 
         # Prepare basic user data for AI
         user_data = {
             k: v
             for k, v in user_args.items()
-            if v is not None and k != 'broker_filter'
+            if v is not None and k not in RUN_OPTION_ARGS
         }
 
-        form_url = config.get('url')
-        if not form_url:
-            print(f"No URL found in config for {broker_name}. Skipping.")
-            return False
+        form_url = config['url']
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=False)
-            context = create_browser_context(browser)
-            page = context.new_page()
+        context = browser_session.new_context()
+        page = context.new_page()
+        healthy = True
 
-            try:
-                print(f"\n🤖 Analyzing {broker_name} form with AI...")
-
-                # Navigate to form
-                print(f"Navigating to form: {form_url}")
-                page.goto(form_url)
-                page.wait_for_load_state('networkidle')
-
-                # Take initial screenshot
-                take_screenshot(page, f"{broker_name.lower()}_ai_initial")
-
-                # Handle AI workflow
-                success = self.ai_fallback.handle_full_ai_workflow(
-                    config, user_data, page)
-
-                # Take final screenshot
-                screenshot_suffix = "ai_success" if success else "ai_cancelled"
-                take_screenshot(page,
-                                f"{broker_name.lower()}_{screenshot_suffix}")
-
-                return success
-
-            except AIFallbackError as e:
-                print(f"\n❌ AI fallback error: {str(e)}")
-                if e.recovery_suggestions:
-                    print("Recovery suggestions:")
-                    for suggestion in e.recovery_suggestions:
-                        print(f"  - {suggestion}")
-                take_screenshot(page, f"{broker_name.lower()}_ai_error")
-                return False
-            finally:
-                browser.close()
+        try:
+            logger.info(f"\n🤖 Analyzing {broker_name} form with AI...")
+
+            # Navigate to form
+            logger.info(f"Navigating to form: {form_url}")
+            navigate_to_form(page, form_url)
+
+            # Handle AI workflow
+            # This worker only takes AI brokers, so while the LLM maps the
+            # fields, open the unblocked context its next broker will use
+            success = self.ai_fallback.handle_full_ai_workflow(
+                config,
+                user_data,
+                page,
+                while_mapping=browser_session.prewarm_context)
+
+            # Take final screenshot
+            screenshot_suffix = "ai_success" if success else "ai_cancelled"
+            take_screenshot(page, f"{broker_name.lower()}_{screenshot_suffix}")
 
-    def _handle_web_form(self, config: dict, user_data: dict) -> bool:
+            return success
+
+        except AIFallbackError as e:
+            logger.info(f"\n❌ AI fallback error: {str(e)}")
+            if e.recovery_suggestions:
+                logger.info("Recovery suggestions:")
+                for suggestion in e.recovery_suggestions:
+                    logger.info(f"  - {suggestion}")
+            take_screenshot(page, f"{broker_name.lower()}_ai_error")
+            return False
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            browser_session.release_context(context, healthy)
+
+    def _handle_web_form(self, config: dict, user_data: dict,
+                         browser_session: BrowserSession) -> bool:
         """Handle web form submission workflow.
         
         Args:
             config: Broker configuration
             user_data: Prepared user data
+            browser_session: Browser shared by this worker's brokers
             
         Returns:
             True if successful, False otherwise
         """
-        broker_name = config.get('name', 'Unknown')
+        broker_name = config['name']
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=False)
-            context = create_browser_context(browser)
-            page = context.new_page()
+        # Solving takes far longer than loading the form, so start it first
+        captcha = self.form_handler.start_captcha(config)
 
-            try:
-                print(f"\n=== Starting {broker_name} Data Deletion Flow ===")
+        # The form is submitted through its API, so page assets are not needed
+        context = browser_session.new_context(
+            blocked_resource_types=NON_ESSENTIAL_RESOURCE_TYPES)
+        page = context.new_page()
+        healthy = True
 
-                # Navigate to form
-                print(f"Navigating to {broker_name} deletion form...")
-                page.goto(config['url'])
-                page.wait_for_load_state('networkidle')
+        try:
+            logger.info(f"\n=== Starting {broker_name} Data Deletion Flow ===")
 
-                # Take initial screenshot
-                take_screenshot(page, f"{broker_name.lower()}_form_initial")
+            # Navigate to form
+            logger.info(f"Navigating to {broker_name} deletion form...")
+            navigate_to_form(page, config['url'],
+                             config['form_config'].get('ready_selector'))
 
-                # Submit form
-                result = self.form_handler.submit_web_form(
-                    config, user_data, page)
+            # Submit form
+            result = self.form_handler.submit_web_form(config, user_data, page,
+                                                       captcha)
 
-                # Take screenshot after submission
-                take_screenshot(page, f"{broker_name.lower()}_form_submitted")
+            # Take screenshot after submission
+            take_screenshot(page, f"{broker_name.lower()}_form_submitted")
 
-                print(f"\n=== Form Submission Result ===")
-                print(f"Status: {'Success' if result.success else 'Failed'}")
-                print(f"Message: {result.message}")
+            logger.info(f"\n=== Form Submission Result ===")
+            logger.info(f"Status: {'Success' if result.success else 'Failed'}")
+            logger.info(f"Message: {result.message}")
 
-                if result.success:
-                    # Check for email confirmation
-                    print(f"\nChecking for confirmation email...")
-                    confirmation_result = self.form_handler.check_email_confirmation(
-                        config, user_data, result.submission_time)
-                    print(
-                        f"Confirmation check: {confirmation_result['message']}"
-                    )
+            if result.success:
+                # Confirmation emails are checked once all brokers finish
+                self._pending_confirmations.append(
+                    (config, result.submission_time))
 
-                return result.success
+            return result.success
 
-            except FormSubmissionError as e:
-                print(f"\n❌ Form submission error: {str(e)}")
-                take_screenshot(page, f"{broker_name.lower()}_form_error")
-                return False
-            except Exception as e:
-                print(f"\n❌ Unexpected error: {str(e)}")
-                take_screenshot(page, f"{broker_name.lower()}_form_error")
-                return False
-            finally:
-                browser.close()
+        except FormSubmissionError as e:
+            logger.info(f"\n❌ Form submission error: {str(e)}")
+            if e.recovery_suggestions:
+                logger.info("Recovery suggestions:")
+                for suggestion in e.recovery_suggestions:
+                    logger.info(f"  - {suggestion}")
+            take_screenshot(page, f"{broker_name.lower()}_form_error")
+            return False
+        except Exception as e:
+            logger.info(f"\n❌ Unexpected error: {str(e)}")
+            healthy = False
+            take_screenshot(page, f"{broker_name.lower()}_form_error")
+            return False
+        finally:
+            browser_session.release_context(context, healthy)
 
     def _handle_email_request(self, config: dict, user_data: dict) -> bool:
         """Handle email-based deletion request.
@@ -269,43 +440,58 @@ class DataDeletionOrchestrator:
         Returns:
             True if successful, False otherwise
         """
-        broker_name = config.get('name', 'Unknown')
-        print(f"\n=== Starting {broker_name} Email Deletion Flow ===")
+        broker_name = config['name']
+        logger.info(f"\n=== Starting {broker_name} Email Deletion Flow ===")
 
         # Placeholder for email functionality
-        print(f"Email-based deletion request would be sent to {broker_name}")
+        logger.info(
+            f"Email-based deletion request would be sent to {broker_name}")
         return True
 
+    def _check_confirmations(self, user_email: str):
+        """Check confirmation emails for all submitted forms.
+
+        Args:
+            user_email: User's email address
+        """
+        logger.info(f"\n=== Checking for confirmation emails ===")
+        confirmation_results = self.form_handler.check_email_confirmations(
+            self._pending_confirmations, user_email)
+
+        for broker_name, confirmation_result in confirmation_results.items():
+            logger.info(f"{broker_name} confirmation check: "
+                        f"{confirmation_result['message']}")
+
     def _print_summary(self, summary: dict):
         """Print processing summary to console.
         
         Args:
             summary: Summary dictionary from broker processor
         """
-        print(f"\n{'='*60}")
-        print(f"SUMMARY")
-        print(f"{'='*60}")
-        print(f"Total brokers processed: {summary['total_brokers']}")
-        print(f"Successful: {summary['successful_count']}")
-        print(f"Failed: {summary['failed_count']}")
+        logger.info("\n%s", '=' * 60)
+        logger.info("SUMMARY")
+        logger.info("%s", '=' * 60)
+        logger.info("Total brokers processed: %s", summary['total_brokers'])
+        logger.info("Successful: %s", summary['successful_count'])
+        logger.info("Failed: %s", summary['failed_count'])
 
         if summary.get('success_rate'):
-            print(f"Success rate: {summary['success_rate']}%")
+            logger.info("Success rate: %s%%", summary['success_rate'])
 
         if summary.get('successful_brokers'):
-            print(f"\n✓ Successful deletions:")
+            logger.info("\n✓ Successful deletions:")
             for broker in summary['successful_brokers']:
-                print(f"  - {broker}")
+                logger.info("  - %s", broker)
 
         if summary.get('failed_brokers'):
-            print(f"\n❌ Failed deletions:")
+            logger.info("\n❌ Failed deletions:")
             for broker in summary['failed_brokers']:
-                print(f"  - {broker}")
+                logger.info("  - %s", broker)
 
         if summary.get('recommendations'):
-            print(f"\n💡 Recommendations:")
+            logger.info("\n💡 Recommendations:")
             for rec in summary['recommendations']:
-                print(f"  - {rec}")
+                logger.info("  - %s", rec)
 
 
 def main():
@@ -329,9 +515,59 @@ def main():
         help='Your state (2-letter code or full name, e.g., CA or California)',
         type=validate_state_input)
     parser.add_argument('--zip-code', help='Your ZIP code')
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=
+        f'Maximum number of brokers to process in parallel (default: {DEFAULT_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--ai-concurrency',
+        type=int,
+        default=DEFAULT_AI_CONCURRENCY,
+        help=
+        f'Maximum number of AI fallback brokers to process in parallel (default: {DEFAULT_AI_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--confirm-mode',
+        choices=CONFIRM_MODES,
+        default='interactive',
+        help=
+        'How AI-filled forms are confirmed: prompt on stdin, submit automatically, or wait for a response file in the confirmations/ queue (default: interactive)'
+    )
+    parser.add_argument(
+        '--auto-confirm-threshold',
+        type=int,
+        default=DEFAULT_AUTO_CONFIRM_THRESHOLD,
+        help=
+        f'Minimum filled fields for --confirm-mode auto to submit a form (default: {DEFAULT_AUTO_CONFIRM_THRESHOLD})'
+    )
+    browser_window = parser.add_mutually_exclusive_group()
+    browser_window.add_argument(
+        '--headless',
+        action='store_true',
+        default=None,
+        help=
+        'Run every browser without a window, including for --confirm-mode interactive (default: only interactive AI review shows a window)'
+    )
+    browser_window.add_argument(
+        '--show-browser',
+        dest='headless',
+        action='store_false',
+        default=None,
+        help=
+        'Show a browser window for every broker, e.g. to debug form filling')
+
+    parser.add_argument('--no-screenshots',
+                        action='store_true',
+                        help='Do not save debug screenshots of broker pages')
 
     args = parser.parse_args()
 
+    if args.no_screenshots:
+        set_screenshots_enabled(False)
+
     # Convert args to dictionary for easier passing
     user_args = {
         'broker_filter': args.broker,
@@ -346,7 +582,12 @@ def main():
     }
 
     # Run workflow
-    orchestrator = DataDeletionOrchestrator()
+    orchestrator = DataDeletionOrchestrator(
+        concurrency=args.concurrency,
+        ai_concurrency=args.ai_concurrency,
+        confirm_mode=args.confirm_mode,
+        auto_confirm_threshold=args.auto_confirm_threshold,
+        headless=args.headless)
     orchestrator.run_deletion_workflow(user_args)
 
 
@@ -1,10 +1,28 @@
 """AI-powered fallback service for analyzing unknown broker forms."""
-from typing import Dict, Optional, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, List
 from dataclasses import dataclass
 from playwright.sync_api import Page
 
-from utils.constrained_ai import ConstrainedFormMapper, generate_broker_config, save_discovered_config
-from utils.browser import analyze_form, fill_form_deterministically, submit_form
+from utils.constrained_ai import (ConstrainedFormMapper,
+                                  generate_broker_config,
+                                  load_discovered_mappings,
+                                  save_discovered_config)
+from utils.browser import (analyze_form, fill_form_deterministically,
+                           submit_form, take_screenshot)
+from services.confirmation_queue import ConfirmationQueue
+from utils.broker_log import (get_broker_logger, flush_broker_output,
+                              with_broker_output)
+
+logger = get_broker_logger()
+
+# How filled forms are confirmed before submission: prompt on stdin, decide
+# from the number of filled fields, or wait on a reviewer via ConfirmationQueue
+CONFIRM_MODES = ('interactive', 'auto', 'queue')
+
+# Minimum number of filled fields for auto mode to submit a form
+DEFAULT_AUTO_CONFIRM_THRESHOLD = 3
 
 
 @dataclass
@@ -32,18 +50,45 @@ class AIFallbackError(Exception):
 class AIFallbackService:
     """Handles AI-powered form analysis and filling for unknown brokers."""
 
-    def __init__(self):
-        """Initialize the AI fallback service."""
+    def __init__(self,
+                 confirm_mode: str = 'interactive',
+                 auto_confirm_threshold: int = DEFAULT_AUTO_CONFIRM_THRESHOLD,
+                 confirmation_queue: Optional[ConfirmationQueue] = None):
+        """Initialize the AI fallback service.
+
+        Args:
+            confirm_mode: One of CONFIRM_MODES
+            auto_confirm_threshold: Filled fields needed to submit in auto mode
+            confirmation_queue: Queue used in queue mode
+
+        Raises:
+            ValueError: If confirm_mode is not a known mode
+        """
+        if confirm_mode not in CONFIRM_MODES:
+            raise ValueError(f"Unknown confirm mode: {confirm_mode}")
+        self.confirm_mode = confirm_mode
+        self.auto_confirm_threshold = auto_confirm_threshold
+        self.confirmation_queue = confirmation_queue or ConfirmationQueue()
         self.ai_mapper = ConstrainedFormMapper()
+        # LLM mapping calls run here so browser work can overlap with them
+        self._mapping_executor = ThreadPoolExecutor(
+            thread_name_prefix='ai-mapping')
+        # Brokers run on worker threads; only one may prompt on stdin at a time
+        self._prompt_lock = threading.Lock()
 
-    def analyze_and_fill_form(self, config: Dict, user_data: Dict,
-                              page: Page) -> AIAnalysisResult:
+    def analyze_and_fill_form(
+            self,
+            config: Dict,
+            user_data: Dict,
+            page: Page,
+            while_mapping: Optional[Callable] = None) -> AIAnalysisResult:
         """Analyze form structure and fill using AI mapping.
         
         Args:
             config: Minimal broker configuration  
             user_data: User data dictionary
             page: Playwright page instance
+            while_mapping: Work to run on this thread during the LLM call
             
         Returns:
             AIAnalysisResult with analysis outcome
@@ -51,11 +96,11 @@ class AIFallbackService:
         Raises:
             AIFallbackError: If analysis fails unrecoverably
         """
-        broker_name = config.get('name', 'Unknown')
+        broker_name = config['name']
 
         try:
             # Analyze form structure
-            print("Analyzing form structure...")
+            logger.info("Analyzing form structure...")
             form_analysis = analyze_form(page)
 
             if not form_analysis.get('fields'):
@@ -68,14 +113,28 @@ class AIFallbackService:
                         "Ensure JavaScript is enabled and page is fully loaded"
                     ])
 
-            print(f"Found {len(form_analysis['fields'])} form fields")
+            logger.info(f"Found {len(form_analysis['fields'])} form fields")
 
-            # Use constrained AI to map fields
-            field_mapping = self.ai_mapper.map_form_fields(
-                form_analysis, user_data, broker_name)
+            # Mappings saved by an earlier successful run skip the LLM
+            form_config = config.get('form_config', {})
+            saved_mappings = (form_config.get('field_mappings')
+                              or load_discovered_mappings(broker_name))
+
+            # Map fields with constrained AI in the background; the LLM
+            # round trip is the slowest step, so let the caller work meanwhile
+            mapping_future = self._mapping_executor.submit(
+                with_broker_output(self.ai_mapper.map_form_fields),
+                form_analysis, user_data, broker_name, saved_mappings)
+            if while_mapping is not None:
+                try:
+                    while_mapping()
+                except Exception as e:
+                    # The caller's work is optional; don't fail the broker
+                    logger.info(f"⚠ Work during AI mapping failed: {str(e)}")
+            field_mapping = mapping_future.result()
 
             # Fill form using AI mapping
-            print("\n🤖 Filling form using AI field mapping...")
+            logger.info("\n🤖 Filling form using AI field mapping...")
             fill_results = fill_form_deterministically(page, field_mapping,
                                                        user_data)
 
@@ -111,12 +170,12 @@ class AIFallbackService:
         Returns:
             True if submission successful, False otherwise
         """
-        broker_name = config.get('name', 'Unknown')
+        broker_name = config['name']
 
         try:
             # Try to submit the form
             submit_form(page, form_analysis.get('submit_button'))
-            print("✓ Form submitted successfully")
+            logger.info("✓ Form submitted successfully")
 
             # Generate config for future use
             generated_config = generate_broker_config(
@@ -127,64 +186,116 @@ class AIFallbackService:
                 user_data=user_data)
 
             config_path = save_discovered_config(broker_name, generated_config)
-            print(f"\n💾 Generated config saved for future use: {config_path}")
+            logger.info(
+                f"\n💾 Generated config saved for future use: {config_path}")
 
             return True
 
         except Exception as e:
-            print(f"❌ Form submission failed: {str(e)}")
+            logger.info(f"❌ Form submission failed: {str(e)}")
             return False
 
-    def get_user_confirmation(self, analysis_result: AIAnalysisResult) -> bool:
+    def get_user_confirmation(self,
+                              analysis_result: AIAnalysisResult,
+                              broker_name: str = 'Unknown',
+                              page: Optional[Page] = None) -> bool:
         """Get user confirmation before form submission.
-        
+
+        Depending on confirm_mode, asks on stdin, decides from the number of
+        filled fields, or waits for a reviewer's answer through the
+        confirmation queue. Only interactive mode blocks other brokers.
+
         Args:
             analysis_result: Results from form analysis
-            
+            broker_name: Broker whose form was filled
+            page: Playwright page instance, used to capture the filled form
+                for reviewers in queue mode
+
         Returns:
             True if user confirms submission, False otherwise
         """
-        print(f"\n=== Fill Results ===")
-        print(f"Filled: {analysis_result.fields_filled} fields")
-        print(f"Total fields found: {analysis_result.fields_found}")
+        logger.info(f"\n=== Fill Results ===")
+        logger.info(f"Filled: {analysis_result.fields_filled} fields")
+        logger.info(f"Total fields found: {analysis_result.fields_found}")
 
         if analysis_result.errors:
-            print("Errors:")
+            logger.info("Errors:")
             for error in analysis_result.errors:
-                print(f"  - {error}")
+                logger.info(f"  - {error}")
+
+        if analysis_result.fields_filled == 0:
+            logger.info(
+                "❌ No fields were successfully filled. Cannot submit form.")
+            return False
+
+        if self.confirm_mode == 'auto':
+            if analysis_result.fields_filled >= self.auto_confirm_threshold:
+                logger.info("✓ Auto-confirming submission")
+                return True
+            logger.info(
+                f"❌ Fewer than {self.auto_confirm_threshold} fields filled; "
+                "not auto-confirming")
+            return False
 
-        if analysis_result.fields_filled > 0:
-            print(
+        if self.confirm_mode == 'queue':
+            details = {
+                'screenshot_path': None,
+                'html_path': None,
+                'fields_filled': analysis_result.fields_filled,
+                'fields_found': analysis_result.fields_found,
+                'errors': analysis_result.errors or []
+            }
+            if page is not None:
+                screenshot_path = take_screenshot(
+                    page, f"{broker_name.lower()}_ai_filled")
+                if screenshot_path:
+                    details['screenshot_path'] = str(screenshot_path)
+                details['html_path'] = str(
+                    self.confirmation_queue.save_page(broker_name,
+                                                      page.content()))
+            logger.info(f"⏳ Waiting for confirmation in "
+                        f"{self.confirmation_queue.directory}")
+            flush_broker_output()
+            return self.confirmation_queue.request_confirmation(
+                broker_name, details)
+
+        with self._prompt_lock:
+            logger.info(
                 "\n⚠ IMPORTANT: Please review the filled form before submitting."
             )
+            # The prompt must follow this broker's output, not precede it
+            flush_broker_output()
             submit_choice = input("Submit the form? (y/N): ").strip().lower()
             return submit_choice == 'y'
-        else:
-            print("❌ No fields were successfully filled. Cannot submit form.")
-            return False
 
-    def handle_full_ai_workflow(self, config: Dict, user_data: Dict,
-                                page: Page) -> bool:
+    def handle_full_ai_workflow(
+            self,
+            config: Dict,
+            user_data: Dict,
+            page: Page,
+            while_mapping: Optional[Callable] = None) -> bool:
         """Handle complete AI fallback workflow.
         
         Args:
             config: Minimal broker configuration
             user_data: User data dictionary  
             page: Playwright page instance
+            while_mapping: Work to run on this thread during the LLM call
             
         Returns:
             True if workflow completed successfully, False otherwise
         """
-        broker_name = config.get('name', 'Unknown')
+        broker_name = config['name']
 
         try:
             # Step 1: Analyze and fill form
             analysis_result = self.analyze_and_fill_form(
-                config, user_data, page)
+                config, user_data, page, while_mapping)
 
             # Step 2: Get user confirmation
-            if not self.get_user_confirmation(analysis_result):
-                print("Form submission cancelled by user")
+            if not self.get_user_confirmation(analysis_result, broker_name,
+                                              page):
+                logger.info("Form submission cancelled by user")
                 return False
 
             # Step 3: Submit form and generate config
@@ -196,9 +307,9 @@ class AIFallbackService:
                 user_data)
 
         except AIFallbackError as e:
-            print(f"\n❌ AI fallback error: {str(e)}")
+            logger.info(f"\n❌ AI fallback error: {str(e)}")
             if e.recovery_suggestions:
-                print("Recovery suggestions:")
+                logger.info("Recovery suggestions:")
                 for suggestion in e.recovery_suggestions:
-                    print(f"  - {suggestion}")
+                    logger.info(f"  - {suggestion}")
             return False
@@ -1,9 +1,31 @@
 """Broker processing service for managing data deletion workflows."""
+import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+import orjson
+
+from services.config_schema import (BROKER_CONFIG_VALIDATOR,
+                                    DETERMINISTIC_CONFIG_VALIDATOR,
+                                    find_config_error)
+from utils.templates import compile_template
+
+# Maximum number of threads used to read configuration files
+CONFIG_LOAD_WORKERS = 8
+
+# Processing approach tagged onto each config as '_flavor' when it is loaded
+FLAVOR_DETERMINISTIC = 'deterministic'
+FLAVOR_AI = 'ai'
+
+# Buckets BrokerProcessor.classify sorts configurations into
+BUCKET_DETERMINISTIC_WEB = 'deterministic_web'
+BUCKET_DETERMINISTIC_EMAIL = 'deterministic_email'
+BUCKET_AI_FALLBACK = 'ai_fallback'
+BUCKET_INVALID = 'invalid'
+
 
 @dataclass
 class ProcessingResult:
@@ -33,9 +55,18 @@ class BrokerProcessor:
         """Initialize with optional config directory override."""
         self.config_directory = config_directory or (
             Path(__file__).parent.parent / 'broker_configs')
+        # Configurations loaded by this processor, with the file state key
+        # they were loaded at
+        self._loaded_state: Optional[str] = None
+        self._loaded_configs: Optional[List[Dict]] = None
+        # Lowercased broker name to configs, for the loaded configurations
+        self._loaded_index: Optional[Dict[str, List[Dict]]] = None
 
     def get_all_configurations(self) -> List[Dict]:
         """Load all broker configurations from directory.
+
+        Parsed configurations are kept in memory and reused until any
+        configuration file is added, removed or modified.
         
         Returns:
             List of broker configuration dictionaries
@@ -51,8 +82,7 @@ class BrokerProcessor:
                     "Add at least one broker configuration JSON file"
                 ])
 
-        configs = []
-        config_files = list(self.config_directory.glob('*.json'))
+        config_files = sorted(self.config_directory.glob('*.json'))
 
         if not config_files:
             raise BrokerConfigurationError(
@@ -62,38 +92,152 @@ class BrokerProcessor:
                     "Check file permissions on configuration directory"
                 ])
 
-        for config_file in config_files:
-            try:
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
-
-                # Basic validation
-                if not config.get('name'):
-                    raise BrokerConfigurationError(
-                        f"Configuration missing 'name' field: {config_file.name}",
-                        recovery_suggestions=[
-                            f"Add 'name' field to {config_file.name}",
-                            "Refer to existing configurations for examples"
-                        ])
-
-                configs.append(config)
-
-            except json.JSONDecodeError as e:
+        state_key = self._get_state_key(config_files)
+        if state_key == self._loaded_state:
+            return self._loaded_configs
+
+        # Read files concurrently so their disk reads overlap
+        max_workers = min(CONFIG_LOAD_WORKERS, len(config_files))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            raw_configs = list(
+                executor.map(self._read_config_file, config_files))
+
+        configs = []
+        for config, config_file in zip(raw_configs, config_files):
+            configs.append(self._prepare_config(config, config_file))
+
+        self._loaded_state = state_key
+        self._loaded_configs = configs
+        self._loaded_index = None
+        return configs
+
+    def _read_config_file(self, config_file: Path) -> Dict:
+        """Read and parse a single broker configuration file.
+
+        Args:
+            config_file: Path to the configuration JSON file
+
+        Returns:
+            Parsed configuration JSON
+
+        Raises:
+            BrokerConfigurationError: If the file cannot be read or parsed
+        """
+        try:
+            with open(config_file, 'rb') as f:
+                return orjson.loads(f.read())
+
+        except json.JSONDecodeError as e:
+            raise BrokerConfigurationError(
+                f"Invalid JSON in {config_file.name}: {str(e)}",
+                recovery_suggestions=[
+                    f"Fix JSON syntax in {config_file.name}",
+                    "Use a JSON validator to check format"
+                ])
+        except Exception as e:
+            raise BrokerConfigurationError(
+                f"Error loading {config_file.name}: {str(e)}",
+                recovery_suggestions=[
+                    f"Check file permissions for {config_file.name}",
+                    "Verify file is not corrupted"
+                ])
+
+    def _prepare_config(self, config: Dict, config_file: Path) -> Dict:
+        """Validate a parsed configuration and prepare it for processing.
+
+        Args:
+            config: Parsed configuration JSON from _read_config_file
+            config_file: Path the configuration was loaded from
+
+        Returns:
+            Broker configuration dictionary
+
+        Raises:
+            BrokerConfigurationError: If the configuration is invalid
+        """
+        try:
+            if not isinstance(config, dict):
                 raise BrokerConfigurationError(
-                    f"Invalid JSON in {config_file.name}: {str(e)}",
+                    f"Configuration is not a JSON object: {config_file.name}",
                     recovery_suggestions=[
-                        f"Fix JSON syntax in {config_file.name}",
-                        "Use a JSON validator to check format"
+                        "Refer to existing configurations for examples"
                     ])
-            except Exception as e:
+
+            # Basic validation
+            if not config.get('name'):
                 raise BrokerConfigurationError(
-                    f"Error loading {config_file.name}: {str(e)}",
+                    f"Configuration missing 'name' field: {config_file.name}",
                     recovery_suggestions=[
-                        f"Check file permissions for {config_file.name}",
-                        "Verify file is not corrupted"
+                        f"Add 'name' field to {config_file.name}",
+                        "Refer to existing configurations for examples"
                     ])
 
-        return configs
+            self._validate_config(config, BROKER_CONFIG_VALIDATOR, config_file)
+
+            # Decide the processing approach once instead of per run
+            config['_flavor'] = (FLAVOR_AI
+                                 if self.is_minimal_configuration(config) else
+                                 FLAVOR_DETERMINISTIC)
+
+            # Full configs are submitted without further checks
+            if config['_flavor'] == FLAVOR_DETERMINISTIC:
+                self._validate_config(config, DETERMINISTIC_CONFIG_VALIDATOR,
+                                      config_file)
+
+            # Compile the payload template once instead of on every submission
+            submission = config.get('form_config', {}).get('submission', {})
+            if 'payload_template' in submission:
+                submission['_compiled_payload'] = compile_template(
+                    submission['payload_template'])
+
+            return config
+
+        except BrokerConfigurationError:
+            raise
+        except Exception as e:
+            raise BrokerConfigurationError(
+                f"Error loading {config_file.name}: {str(e)}",
+                recovery_suggestions=[
+                    f"Check the structure of {config_file.name}",
+                    "Refer to existing configurations for examples"
+                ])
+
+    def _validate_config(self, config: Dict, validator, config_file: Path):
+        """Check a configuration against a schema.
+
+        Args:
+            config: Broker configuration dictionary
+            validator: Compiled schema validator from services.config_schema
+            config_file: Path the configuration was loaded from
+
+        Raises:
+            BrokerConfigurationError: If the configuration does not match
+        """
+        error = find_config_error(config, validator)
+        if error:
+            raise BrokerConfigurationError(
+                f"Invalid configuration in {config_file.name}: {error}",
+                recovery_suggestions=[
+                    f"Fix the reported field in {config_file.name}",
+                    "Refer to existing configurations for examples"
+                ])
+
+    def _get_state_key(self, config_files: List[Path]) -> str:
+        """Fingerprint the config files' names, modification times and sizes.
+
+        Args:
+            config_files: Sorted list of configuration file paths
+
+        Returns:
+            Key that changes whenever any configuration file changes
+        """
+        state = hashlib.sha256()
+        for config_file in config_files:
+            stat = config_file.stat()
+            state.update(
+                f"{config_file.name}:{stat.st_mtime_ns}:{stat.st_size}\n".
+                encode())
+        return state.hexdigest()[:16]
 
     def filter_configurations(
             self,
@@ -114,10 +258,7 @@ class BrokerProcessor:
         if not broker_filter:
             return configs
 
-        filtered = [
-            c for c in configs
-            if c.get('name', '').lower() == broker_filter.lower()
-        ]
+        filtered = self._get_name_index(configs).get(broker_filter.lower(), [])
 
         if not filtered:
             available_brokers = [c.get('name', 'Unknown') for c in configs]
@@ -132,6 +273,34 @@ class BrokerProcessor:
 
         return filtered
 
+    def _get_name_index(self, configs: List[Dict]) -> Dict[str, List[Dict]]:
+        """Index configurations by lowercased broker name.
+
+        The index of the configurations this processor loaded is built once
+        and reused; other lists are indexed on each call.
+
+        Args:
+            configs: List of configurations
+
+        Returns:
+            Dictionary mapping lowercased broker name to its configurations
+        """
+        if configs is self._loaded_configs and self._loaded_index is not None:
+            return self._loaded_index
+
+        index = self._build_name_index(configs)
+        if configs is self._loaded_configs:
+            self._loaded_index = index
+        return index
+
+    @staticmethod
+    def _build_name_index(configs: List[Dict]) -> Dict[str, List[Dict]]:
+        """Group configurations by lowercased broker name."""
+        index = {}
+        for config in configs:
+            index.setdefault(config.get('name', '').lower(), []).append(config)
+        return index
+
     def is_minimal_configuration(self, config: Dict) -> bool:
         """Determine if a broker config is minimal (requires AI fallback).
         
@@ -141,6 +310,10 @@ class BrokerProcessor:
         Returns:
             True if config is minimal and needs AI fallback
         """
+        # Configs are tagged with their flavor when loaded
+        if '_flavor' in config:
+            return config['_flavor'] == FLAVOR_AI
+
         form_config = config.get('form_config', {})
         submission = form_config.get('submission', {})
 
@@ -154,6 +327,38 @@ class BrokerProcessor:
 
         return False
 
+    def classify(self, configs: List[Dict]) -> Dict[str, List[Dict]]:
+        """Sort configurations by how they will be processed, in one pass.
+
+        Minimal configurations go to the AI fallback unless they have no
+        URL to analyze; full configurations are split by broker type.
+
+        Args:
+            configs: List of configurations
+
+        Returns:
+            Dictionary mapping each BUCKET_* name to its configurations, in
+            their original order
+        """
+        buckets = {
+            BUCKET_DETERMINISTIC_WEB: [],
+            BUCKET_DETERMINISTIC_EMAIL: [],
+            BUCKET_AI_FALLBACK: [],
+            BUCKET_INVALID: []
+        }
+        for config in configs:
+            if self.is_minimal_configuration(config):
+                bucket = (BUCKET_AI_FALLBACK
+                          if config.get('url') else BUCKET_INVALID)
+            elif config.get('type') == 'web_form':
+                bucket = BUCKET_DETERMINISTIC_WEB
+            elif config.get('type') == 'email_only':
+                bucket = BUCKET_DETERMINISTIC_EMAIL
+            else:
+                bucket = BUCKET_INVALID
+            buckets[bucket].append(config)
+        return buckets
+
     def get_processing_summary(self, successful: List[str],
                                failed: List[str]) -> Dict:
         """Generate processing summary report.
@@ -0,0 +1,141 @@
+"""JSON schemas that broker configuration files are validated against."""
+from typing import Dict, Optional
+
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
+
+# Shape every broker configuration must have, minimal or full
+BROKER_CONFIG_SCHEMA = {
+    "type": "object",
+    "required": ["name", "type"],
+    "properties": {
+        "name": {
+            "type": "string",
+            "minLength": 1
+        },
+        "type": {
+            "enum": ["web_form", "email_only"]
+        },
+        "url": {
+            "type": "string"
+        },
+        "email_domains": {
+            "type": "array",
+            "items": {
+                "type": "string"
+            }
+        },
+        "form_config": {
+            "type": "object",
+            "properties": {
+                "state_format": {
+                    "enum": ["code", "full"]
+                },
+                "ready_selector": {
+                    "type": "string"
+                },
+                "field_mappings": {
+                    "type": "object"
+                },
+                "submission": {
+                    "type": "object",
+                    "properties": {
+                        "method": {
+                            "type": "string"
+                        },
+                        "endpoint": {
+                            "type": "string"
+                        },
+                        "requires_captcha": {
+                            "type": "boolean"
+                        },
+                        "requires_jwt": {
+                            "type": "boolean"
+                        },
+                        "headers": {
+                            "type": "object",
+                            "additionalProperties": {
+                                "type": "string"
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        "captcha_config": {
+            "type": "object",
+            "properties": {
+                "website_key": {
+                    "type": "string",
+                    "minLength": 1
+                }
+            }
+        }
+    }
+}
+
+# Extra requirements for full configurations submitted deterministically, so
+# the submission path can index these fields directly
+DETERMINISTIC_CONFIG_SCHEMA = {
+    "type": "object",
+    "required": ["url", "form_config"],
+    "properties": {
+        "form_config": {
+            "required": ["submission"],
+            "properties": {
+                "submission": {
+                    "required": ["payload_template", "headers"]
+                }
+            }
+        }
+    },
+    "if": {
+        "properties": {
+            "form_config": {
+                "properties": {
+                    "submission": {
+                        "properties": {
+                            "requires_captcha": {
+                                "const": True
+                            }
+                        },
+                        "required": ["requires_captcha"]
+                    }
+                }
+            }
+        }
+    },
+    "then": {
+        "required": ["captcha_config"],
+        "properties": {
+            "captcha_config": {
+                "required": ["website_key"]
+            }
+        }
+    }
+}
+
+# Validators are built once; schema checking happens per config at load time
+BROKER_CONFIG_VALIDATOR = Draft202012Validator(BROKER_CONFIG_SCHEMA)
+DETERMINISTIC_CONFIG_VALIDATOR = Draft202012Validator(
+    DETERMINISTIC_CONFIG_SCHEMA)
+
+
+def find_config_error(config: Dict,
+                      validator: Draft202012Validator) -> Optional[str]:
+    """Validate a broker configuration against a config schema.
+
+    Args:
+        config: Broker configuration dictionary
+        validator: BROKER_CONFIG_VALIDATOR, or DETERMINISTIC_CONFIG_VALIDATOR
+            for configs submitted deterministically
+
+    Returns:
+        Description of the most relevant problem, or None if the config is valid
+    """
+    error = best_match(validator.iter_errors(config))
+    if error is None:
+        return None
+
+    location = '.'.join(str(part) for part in error.absolute_path)
+    return f"{location}: {error.message}" if location else error.message
@@ -0,0 +1,113 @@
+"""File-based queue for confirming AI-filled forms from another process."""
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# Review requests and responses are exchanged through this directory
+DEFAULT_CONFIRMATION_DIRECTORY = Path('confirmations')
+
+# Seconds to wait for a reviewer before treating a request as declined
+DEFAULT_CONFIRMATION_TIMEOUT = 1800
+
+
+class ConfirmationQueue:
+    """Publishes filled forms for review and waits for the reviewer's answer.
+
+    For every broker awaiting review, a ``<broker>.request.json`` file is
+    written to the queue directory. The reviewer answers by writing
+    ``<broker>.response.json`` containing ``{"submit": true}`` or
+    ``{"submit": false}``.
+    """
+
+    def __init__(self,
+                 directory: Optional[Path] = None,
+                 timeout: float = DEFAULT_CONFIRMATION_TIMEOUT,
+                 poll_interval: float = 2):
+        """Initialize the queue.
+
+        Args:
+            directory: Directory requests and responses are exchanged in
+            timeout: Seconds to wait for a response before declining
+            poll_interval: Seconds between checks for a response
+        """
+        self.directory = Path(directory or DEFAULT_CONFIRMATION_DIRECTORY)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    def request_confirmation(self, broker_name: str, details: Dict) -> bool:
+        """Publish a confirmation request and wait for its response.
+
+        Args:
+            broker_name: Broker whose form awaits review
+            details: JSON-serializable details shown to the reviewer
+
+        Returns:
+            True if the reviewer approved submission, False if they declined
+            or no response arrived before the timeout
+        """
+        request_path, response_path = self._get_paths(broker_name)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        response_path.unlink(missing_ok=True)
+
+        # Write atomically so a reviewer never reads a partial request
+        tmp_path = request_path.with_suffix('.tmp')
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    'broker': broker_name,
+                    'requested_at': time.time(),
+                    **details
+                },
+                indent=2))
+        os.replace(tmp_path, request_path)
+
+        try:
+            deadline = time.monotonic() + self.timeout
+            while time.monotonic() < deadline:
+                if response_path.exists():
+                    try:
+                        response = json.loads(response_path.read_text())
+                    except json.JSONDecodeError:
+                        response = None
+                    if not isinstance(response, dict):
+                        # The reviewer may still be writing the file, or
+                        # wrote something other than an object
+                        time.sleep(self.poll_interval)
+                        continue
+                    response_path.unlink(missing_ok=True)
+                    return response.get('submit') is True
+                time.sleep(self.poll_interval)
+            return False
+        finally:
+            request_path.unlink(missing_ok=True)
+
+    def save_page(self, broker_name: str, html: str) -> Path:
+        """Save a filled page's HTML next to its confirmation request.
+
+        The reviewer can open the snapshot after the browser has moved on,
+        so no window has to stay open while the request waits.
+
+        Args:
+            broker_name: Broker whose form awaits review
+            html: Page content at the time of review
+
+        Returns:
+            Path the HTML snapshot was written to
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        page_path = self.directory / f"{self._get_slug(broker_name)}.page.html"
+        page_path.write_text(html)
+        return page_path
+
+    def _get_slug(self, broker_name: str) -> str:
+        """Get the file name stem used for a broker's queue files."""
+        return re.sub(r'[^a-z0-9]+', '_', broker_name.lower()).strip('_')
+
+    def _get_paths(self, broker_name: str):
+        """Get the request and response file paths for a broker."""
+        slug = self._get_slug(broker_name)
+        return (self.directory / f"{slug}.request.json",
+                self.directory / f"{slug}.response.json")
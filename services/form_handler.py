@@ -1,12 +1,39 @@
 """Form handling service for web-based broker interactions."""
+import logging
+import threading
 import time
-from typing import Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from urllib.parse import urlsplit
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from playwright.sync_api import Page
 
-from utils import (solve_captcha, extract_auth_tokens,
+from utils import (solve_captcha, extract_auth_tokens, is_jwt_valid,
                    substitute_template_variables)
-from utils.gmail import check_confirmation_email, get_gmail_service
+from utils.gmail import (check_confirmation_email, check_confirmation_emails,
+                         get_gmail_service)
+from utils.broker_log import get_broker_logger, with_broker_output
+
+logger = get_broker_logger()
+
+# Hosts with a cached connection pool, and connections kept alive per host;
+# the session is shared by all broker workers so submissions reuse TCP/TLS
+# connections
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 32
+
+# Retries for connections that fail before a request is sent; reads and
+# error statuses aren't retried since a deletion POST may have gone through
+HTTP_CONNECT_RETRIES = 3
+HTTP_RETRY_BACKOFF = 0.3
+
+# CAPTCHAs are solved here, off the broker worker threads, so the remote
+# solve overlaps navigating to the form and extracting its tokens
+_captcha_solver = ThreadPoolExecutor(thread_name_prefix='captcha-solver')
 
 
 @dataclass
@@ -25,23 +52,90 @@ class FormSubmissionError(Exception):
     def __init__(self,
                  message: str,
                  status_code: int = None,
-                 response_data: str = None):
+                 response_data: str = None,
+                 recovery_suggestions: List[str] = None):
         super().__init__(message)
         self.status_code = status_code
         self.response_data = response_data
+        self.recovery_suggestions = recovery_suggestions or []
+
+
+def _is_json_response(response: requests.Response) -> bool:
+    """Check whether a response carries a non-empty JSON body."""
+    content_type = response.headers.get('content-type', '')
+    media_type = content_type.split(';')[0].strip().lower()
+    return bool(response.content) and media_type.endswith('json')
+
+
+def create_http_session() -> requests.Session:
+    """Create an HTTP session that keeps connections to broker hosts alive.
+
+    Returns:
+        Session with a connection pool large enough for concurrent workers
+        that retries failed connection attempts
+    """
+    session = requests.Session()
+    retries = Retry(total=HTTP_CONNECT_RETRIES,
+                    read=0,
+                    backoff_factor=HTTP_RETRY_BACKOFF)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS,
+                          pool_maxsize=HTTP_POOL_MAXSIZE,
+                          max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 
 class FormHandler:
     """Handles web form submission for broker data deletion requests."""
 
-    def submit_web_form(self, config: Dict, user_data: Dict,
-                        page: Page) -> SubmissionResult:
+    def __init__(self, session: Optional[requests.Session] = None):
+        """Initialize with an optional HTTP session.
+
+        Args:
+            session: HTTP session shared by all submissions so connections
+                are pooled across brokers and retries
+        """
+        self.session = session or create_http_session()
+        # Auth data of pages whose JWT is still valid, keyed by page URL
+        self._auth_cache: Dict[str, Dict] = {}
+        self._auth_cache_lock = threading.Lock()
+
+    def start_captcha(self, config: Dict) -> Optional[Future]:
+        """Start solving the broker's CAPTCHA in the background.
+
+        Solving only needs the form URL and site key, so it can begin
+        before the page is opened and run while the worker loads it.
+
+        Args:
+            config: Broker configuration
+
+        Returns:
+            Future resolving to the CAPTCHA response, or None if the broker
+            doesn't require a CAPTCHA
+        """
+        if not config['form_config']['submission'].get('requires_captcha'):
+            return None
+        logger.info("Solving CAPTCHA...")
+
+        # Presence of the site key is checked when the config is loaded
+        website_key = config['captcha_config']['website_key']
+        return _captcha_solver.submit(with_broker_output(solve_captcha),
+                                      config['url'], website_key)
+
+    def submit_web_form(self,
+                        config: Dict,
+                        user_data: Dict,
+                        page: Page,
+                        captcha: Optional[Future] = None) -> SubmissionResult:
         """Submit web form using deterministic configuration.
         
         Args:
             config: Broker configuration with form submission details
             user_data: User data dictionary  
             page: Playwright page instance
+            captcha: CAPTCHA solve from start_captcha(); one is started here
+                if the broker requires a CAPTCHA and none is given
             
         Returns:
             SubmissionResult with outcome details
@@ -52,13 +146,16 @@ class FormHandler:
         try:
             submission_config = config['form_config']['submission']
 
-            # Handle CAPTCHA if required
-            if submission_config.get('requires_captcha'):
-                user_data = self._handle_captcha(config, user_data)
+            # Start the CAPTCHA solve unless the caller already has
+            if captcha is None:
+                captcha = self.start_captcha(config)
 
             # Extract authentication tokens if required
             auth_data = self._extract_auth_tokens(submission_config, page)
 
+            if captcha is not None:
+                user_data = self._handle_captcha(captcha, user_data)
+
             # Prepare and submit request
             submission_time = time.time()
             response = self._submit_request(submission_config, user_data,
@@ -69,7 +166,8 @@ class FormHandler:
                     success=True,
                     message=
                     f"Form submitted successfully with status {response.status_code}",
-                    response_data=response.json() if response.text else {},
+                    response_data=orjson.loads(response.content)
+                    if _is_json_response(response) else {},
                     status_code=response.status_code,
                     submission_time=submission_time)
             else:
@@ -85,13 +183,15 @@ class FormHandler:
             raise FormSubmissionError(
                 f"Form submission error: {str(e)}",
                 status_code=getattr(e, 'status_code', None),
-                response_data=getattr(e, 'response_data', None))
+                response_data=getattr(e, 'response_data', None),
+                recovery_suggestions=getattr(e, 'recovery_suggestions', None))
 
     def check_email_confirmation(self,
                                  config: Dict,
                                  user_data: Dict,
                                  submission_time: float,
-                                 wait_time: int = 300) -> Dict:
+                                 wait_time: int = 300,
+                                 service=None) -> Dict:
         """Check for email confirmation after form submission.
         
         Args:
@@ -99,12 +199,13 @@ class FormHandler:
             user_data: User data dictionary
             submission_time: Unix timestamp when form was submitted
             wait_time: Seconds to wait for confirmation email
+            service: Gmail API service to reuse; defaults to the shared one
             
         Returns:
             Confirmation check result dictionary
         """
         try:
-            gmail_service = get_gmail_service()
+            gmail_service = service or get_gmail_service()
             domains = config.get('email_domains', [])
 
             if not domains:
@@ -148,11 +249,87 @@ class FormHandler:
                 ]
             }
 
-    def _handle_captcha(self, config: Dict, user_data: Dict) -> Dict:
-        """Handle CAPTCHA solving if required.
+    def check_email_confirmations(self,
+                                  submissions: List[Tuple[Dict, float]],
+                                  user_email: str,
+                                  wait_time: int = 300,
+                                  service=None) -> Dict[str, Dict]:
+        """Check for confirmation emails for several submitted forms at once.
+
+        Args:
+            submissions: (broker configuration, submission timestamp) pairs
+            user_email: User's email address
+            wait_time: Seconds to wait for confirmation emails
+            service: Gmail API service to reuse; defaults to the shared one
+
+        Returns:
+            Dictionary mapping broker name to its confirmation check result
+        """
+        results = {}
+        broker_domains = {}
+        submission_times = {}
+
+        for config, submission_time in submissions:
+            domains = config.get('email_domains', [])
+            if not domains:
+                results[config['name']] = {
+                    "status":
+                    "warning",
+                    "message":
+                    f"No email domains configured for {config['name']}",
+                    "recommendations": [
+                        f"Add 'email_domains' array to {config['name']} configuration",
+                        "Check broker documentation for confirmation email domains"
+                    ]
+                }
+                continue
+            broker_domains[config['name']] = domains
+            submission_times[config['name']] = submission_time
+
+        if not broker_domains:
+            return results
+
+        try:
+            gmail_service = service or get_gmail_service()
+            confirmed = check_confirmation_emails(
+                service=gmail_service,
+                user_email=user_email,
+                broker_domains=broker_domains,
+                submission_times=submission_times,
+                wait_time=wait_time)
+        except Exception as e:
+            error_result = {
+                "status":
+                "error",
+                "message":
+                f"Error checking confirmation email: {str(e)}",
+                "recommendations": [
+                    "Check Gmail API credentials and permissions",
+                    "Verify email address has access to Gmail",
+                    "Check network connectivity"
+                ]
+            }
+            results.update({broker: error_result for broker in broker_domains})
+            return results
+
+        for broker, found in confirmed.items():
+            results[broker] = {
+                "status":
+                "success",
+                "confirmed":
+                found,
+                "message":
+                "Confirmation email found"
+                if found else "No confirmation email received"
+            }
+
+        return results
+
+    def _handle_captcha(self, captcha: Future, user_data: Dict) -> Dict:
+        """Wait for a CAPTCHA solve and add its response to the user data.
         
         Args:
-            config: Broker configuration
+            captcha: CAPTCHA solve from start_captcha()
             user_data: User data dictionary
             
         Returns:
@@ -161,21 +338,7 @@ class FormHandler:
         Raises:
             FormSubmissionError: If CAPTCHA solving fails
         """
-        print("Solving CAPTCHA...")
-
-        captcha_config = config.get('captcha_config', {})
-        website_key = captcha_config.get('website_key')
-        website_url = config.get('url')
-
-        if not website_key:
-            raise FormSubmissionError(
-                f"CAPTCHA required but no website_key found in config for {config.get('name')}",
-                recovery_suggestions=[
-                    f"Add 'captcha_config.website_key' to {config.get('name')} configuration",
-                    "Inspect page source to find reCAPTCHA site key"
-                ])
-
-        captcha_response = solve_captcha(website_url, website_key)
+        captcha_response = captcha.result()
         if not captcha_response:
             raise FormSubmissionError(
                 "CAPTCHA solving failed",
@@ -186,7 +349,7 @@ class FormHandler:
                 ])
 
         user_data['captcha_response'] = captcha_response
-        print("CAPTCHA solved successfully")
+        logger.info("CAPTCHA solved successfully")
         return user_data
 
     def _extract_auth_tokens(self, submission_config: Dict,
@@ -203,13 +366,25 @@ class FormHandler:
         auth_data = {}
 
         if submission_config.get('requires_jwt'):
-            print("Extracting authentication tokens...")
+            # Reuse tokens already read from this page while the JWT is valid
+            parts = urlsplit(page.url)
+            cache_key = f"{parts.scheme}://{parts.netloc}{parts.path}"
+            with self._auth_cache_lock:
+                cached = self._auth_cache.get(cache_key)
+            if cached and is_jwt_valid(cached.get('jwtToken')):
+                logger.info("Reusing cached authentication tokens")
+                return cached
+
+            logger.info("Extracting authentication tokens...")
             auth_data = extract_auth_tokens(page)
 
             if auth_data.get('jwtToken'):
-                print(
+                logger.info(
                     f"JWT token found from: {auth_data.get('jwtTokenSource', 'unknown')}"
                 )
+                if is_jwt_valid(auth_data['jwtToken']):
+                    with self._auth_cache_lock:
+                        self._auth_cache[cache_key] = auth_data
 
         return auth_data
 
@@ -226,11 +401,11 @@ class FormHandler:
         Returns:
             HTTP response object
         """
-        import requests
-
-        # Prepare payload using template
+        # Prepare payload using the template compiled at config load time
         payload = substitute_template_variables(
-            submission_config['payload_template'], user_data)
+            submission_config.get('_compiled_payload',
+                                  submission_config['payload_template']),
+            user_data)
 
         # Prepare headers
         headers = submission_config['headers'].copy()
@@ -240,35 +415,45 @@ class FormHandler:
         if auth_data.get('jwtToken'):
             headers['Authorization'] = f'Bearer {auth_data["jwtToken"]}'
             payload['jwtToken'] = auth_data['jwtToken']
-            print("Added JWT token to request")
+            logger.info("Added JWT token to request")
 
         if auth_data.get('csrfToken'):
             headers['X-CSRF-Token'] = auth_data['csrfToken']
-            print("Added CSRF token to request")
+            logger.info("Added CSRF token to request")
 
         if auth_data.get('cookies'):
             headers['Cookie'] = auth_data['cookies']
-            print("Added cookies to request")
+            logger.info("Added cookies to request")
+
+        # Serialize the body ourselves; requests would use the stdlib encoder
+        body = orjson.dumps(payload)
+        if not any(name.lower() == 'content-type' for name in headers):
+            headers['Content-Type'] = 'application/json'
 
         # Submit form
-        print(f"Submitting form to {submission_config['endpoint']}")
-        print(f"Request headers: {len(headers)} headers")
-        print(f"Payload size: {len(str(payload))} characters")
+        logger.info(f"Submitting form to {submission_config['endpoint']}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request headers: %d headers", len(headers))
+            logger.debug("Payload size: %d bytes", len(body))
 
         # Print auth status for debugging
         if auth_data.get('jwtToken'):
-            print(
+            logger.info(
                 f"✓ JWT token included (length: {len(auth_data['jwtToken'])})")
         else:
-            print("⚠ No JWT token found")
+            logger.info("⚠ No JWT token found")
 
-        response = requests.post(submission_config['endpoint'],
-                                 json=payload,
-                                 headers=headers)
+        response = self.session.post(submission_config['endpoint'],
+                                     data=body,
+                                     headers=headers)
 
-        print(f"Response status: {response.status_code}")
+        logger.info(f"Response status: {response.status_code}")
         if response.status_code not in [200, 201]:
-            print(f"Response headers: {dict(response.headers)}")
-            print(f"Response body: {response.text[:500]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response headers: %s", dict(response.headers))
+            # Decode only the logged prefix rather than the whole body
+            logger.info(
+                "Response body: %s...",
+                response.content[:500].decode('utf-8', errors='replace'))
 
         return response
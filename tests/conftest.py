@@ -5,6 +5,15 @@ from unittest.mock import Mock, MagicMock
 import json
 
 
+@pytest.fixture(autouse=True)
+def isolated_discovered_configs(tmp_path, monkeypatch):
+    """Keep generated broker configs out of the repository."""
+    discovered_dir = tmp_path / "discovered"
+    monkeypatch.setattr('utils.constrained_ai.DISCOVERED_CONFIG_DIRECTORY',
+                        discovered_dir)
+    return discovered_dir
+
+
 @pytest.fixture
 def sample_user_data():
     """Sample user data for testing."""
@@ -116,7 +125,13 @@ def temp_config_dir(tmp_path):
             },
             "submission": {
                 "method": "api_post",
-                "endpoint": "https://full.com/api"
+                "endpoint": "https://full.com/api",
+                "payload_template": {
+                    "firstName": "{first_name}"
+                },
+                "headers": {
+                    "content-type": "application/json"
+                }
             }
         }
     }
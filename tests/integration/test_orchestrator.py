@@ -1,6 +1,6 @@
 """Integration tests for DataDeletionOrchestrator."""
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 import os
 
 from broker_agent import DataDeletionOrchestrator
@@ -29,12 +29,11 @@ class TestDataDeletionOrchestrator:
             'zip_code': '12345'
         }
 
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_run_deletion_workflow_no_api_key_error(self, orchestrator):
+    def test_init_no_api_key_error(self):
         """Test error when OPENAI_API_KEY is missing."""
         with patch.dict(os.environ, {}, clear=True):
             with pytest.raises(ValueError) as exc_info:
-                orchestrator.run_deletion_workflow({})
+                DataDeletionOrchestrator()
 
             assert "Please set OPENAI_API_KEY environment variable" in str(
                 exc_info.value)
@@ -75,7 +74,15 @@ class TestDataDeletionOrchestrator:
             "name": "Test Broker",
             "type": "web_form"
         }]
-        mock_processor.is_minimal_configuration.return_value = False
+        mock_processor.classify.return_value = {
+            "deterministic_web": [{
+                "name": "Test Broker",
+                "type": "web_form"
+            }],
+            "deterministic_email": [],
+            "ai_fallback": [],
+            "invalid": []
+        }
         mock_processor.get_processing_summary.return_value = {
             'total_brokers': 1,
             'successful_count': 1,
@@ -89,10 +96,100 @@ class TestDataDeletionOrchestrator:
 
         # Mock the processing method
         with patch.object(orchestrator,
-                          '_process_single_broker',
+                          '_handle_web_form_workflow',
                           return_value=True):
             result = orchestrator.run_deletion_workflow(sample_user_args)
 
         assert result['total_brokers'] == 1
         assert result['successful_count'] == 1
         assert result['success_rate'] == 100.0
+
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    def test_run_deletion_workflow_parallel_failures(self, sample_user_args):
+        """Test brokers run in parallel and errors only fail their broker."""
+        from services.broker_processor import BrokerProcessor
+
+        orchestrator = DataDeletionOrchestrator(concurrency=3)
+        configs = [{
+            "name": f"Broker{i}",
+            "type": "web_form"
+        } for i in range(3)]
+
+        mock_processor = Mock()
+        mock_processor.get_all_configurations.return_value = configs
+        mock_processor.filter_configurations.return_value = configs
+        mock_processor.classify.return_value = {
+            "deterministic_web": configs,
+            "deterministic_email": [],
+            "ai_fallback": [],
+            "invalid": []
+        }
+        mock_processor.get_processing_summary.side_effect = (
+            BrokerProcessor().get_processing_summary)
+        orchestrator.broker_processor = mock_processor
+
+        def process(config, user_args, browser_session):
+            if config['name'] == 'Broker1':
+                raise RuntimeError("boom")
+            return True
+
+        with patch.object(orchestrator,
+                          '_handle_web_form_workflow',
+                          side_effect=process):
+            result = orchestrator.run_deletion_workflow(sample_user_args)
+
+        assert result['successful_brokers'] == ['Broker0', 'Broker2']
+        assert result['failed_brokers'] == ['Broker1']
+
+    @pytest.mark.parametrize("headless, web_headless, ai_headless", [
+        (None, True, False),
+        (True, True, True),
+        (False, False, False),
+    ])
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    @patch('broker_agent.BrowserSession')
+    def test_browser_windows_only_for_interactive_review(
+            self, mock_session_class, headless, web_headless, ai_headless,
+            sample_user_args):
+        """Test only brokers reviewed in the browser get a window by default."""
+        from services.broker_processor import BrokerProcessor
+
+        orchestrator = DataDeletionOrchestrator(headless=headless)
+        web_config = {"name": "WebBroker", "type": "web_form"}
+        ai_config = {"name": "AIBroker", "url": "https://aibroker.com"}
+
+        mock_processor = Mock()
+        mock_processor.get_all_configurations.return_value = [
+            web_config, ai_config
+        ]
+        mock_processor.filter_configurations.side_effect = (
+            lambda configs, broker_filter: configs)
+        mock_processor.classify.return_value = {
+            "deterministic_web": [web_config],
+            "deterministic_email": [],
+            "ai_fallback": [ai_config],
+            "invalid": []
+        }
+        mock_processor.get_processing_summary.side_effect = (
+            BrokerProcessor().get_processing_summary)
+        orchestrator.broker_processor = mock_processor
+
+        def new_session(headless):
+            session = MagicMock(headless=headless)
+            session.__enter__.return_value = session
+            return session
+
+        mock_session_class.side_effect = new_session
+        seen = {}
+
+        def process(config, user_args, browser_session):
+            seen[config['name']] = browser_session.headless
+            return True
+
+        with patch.multiple(
+                orchestrator,
+                _handle_web_form_workflow=Mock(side_effect=process),
+                _handle_ai_workflow=Mock(side_effect=process)):
+            orchestrator.run_deletion_workflow(sample_user_args)
+
+        assert seen == {'WebBroker': web_headless, 'AIBroker': ai_headless}
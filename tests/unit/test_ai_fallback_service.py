@@ -0,0 +1,144 @@
+"""Tests for AIFallbackService confirmation modes."""
+import json
+import os
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from services.ai_fallback_service import AIAnalysisResult, AIFallbackService
+from services.confirmation_queue import ConfirmationQueue
+
+
+@pytest.fixture
+def analysis_result():
+    """Analysis result with a few filled fields."""
+    return AIAnalysisResult(success=True,
+                            fields_found=5,
+                            fields_filled=3,
+                            field_mapping={},
+                            errors=[])
+
+
+@patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+class TestConfirmationModes:
+    """Test how filled forms are confirmed before submission."""
+
+    def test_unknown_mode_rejected(self):
+        """Test an unknown confirm mode raises ValueError."""
+        with pytest.raises(ValueError):
+            AIFallbackService(confirm_mode='maybe')
+
+    @patch('builtins.input')
+    def test_auto_mode_uses_threshold(self, mock_input, analysis_result):
+        """Test auto mode never prompts and respects the threshold."""
+        assert AIFallbackService(
+            confirm_mode='auto',
+            auto_confirm_threshold=3).get_user_confirmation(analysis_result)
+        assert not AIFallbackService(
+            confirm_mode='auto',
+            auto_confirm_threshold=4).get_user_confirmation(analysis_result)
+        mock_input.assert_not_called()
+
+    def test_queue_mode_waits_for_response(self, tmp_path, analysis_result):
+        """Test queue mode publishes a request and reads the response."""
+        queue = ConfirmationQueue(tmp_path, timeout=5, poll_interval=0.01)
+        service = AIFallbackService(confirm_mode='queue',
+                                    confirmation_queue=queue)
+        request_path = tmp_path / 'test_broker.request.json'
+
+        def reviewer():
+            while not request_path.exists():
+                time.sleep(0.01)
+            request = json.loads(request_path.read_text())
+            assert request['broker'] == 'Test Broker'
+            assert request['fields_filled'] == 3
+            (tmp_path / 'test_broker.response.json').write_text(
+                json.dumps({'submit': True}))
+
+        thread = threading.Thread(target=reviewer)
+        thread.start()
+        confirmed = service.get_user_confirmation(analysis_result,
+                                                  'Test Broker')
+        thread.join()
+
+        assert confirmed is True
+        assert not request_path.exists()
+
+    def test_queue_mode_times_out(self, tmp_path, analysis_result):
+        """Test queue mode declines when nobody answers in time."""
+        queue = ConfirmationQueue(tmp_path, timeout=0.05, poll_interval=0.01)
+        service = AIFallbackService(confirm_mode='queue',
+                                    confirmation_queue=queue)
+
+        assert service.get_user_confirmation(analysis_result,
+                                             'Test Broker') is False
+
+    def test_queue_mode_ignores_non_object_response(self, tmp_path,
+                                                    analysis_result):
+        """Test a JSON reply that isn't an object is treated as malformed."""
+        queue = ConfirmationQueue(tmp_path, timeout=0.2, poll_interval=0.01)
+        request_path = tmp_path / 'test_broker.request.json'
+        response_path = tmp_path / 'test_broker.response.json'
+
+        def reviewer():
+            while not request_path.exists():
+                time.sleep(0.01)
+            response_path.write_text('true')
+
+        thread = threading.Thread(target=reviewer)
+        thread.start()
+        confirmed = queue.request_confirmation('Test Broker', {})
+        thread.join()
+
+        assert confirmed is False
+        assert response_path.exists()
+
+    @patch('services.ai_fallback_service.take_screenshot', return_value=None)
+    def test_queue_mode_saves_page_html(self, mock_screenshot, tmp_path,
+                                        analysis_result):
+        """Test queue mode saves the filled page for offline review."""
+        queue = ConfirmationQueue(tmp_path, timeout=0.05, poll_interval=0.01)
+        service = AIFallbackService(confirm_mode='queue',
+                                    confirmation_queue=queue)
+        page = Mock()
+        page.content.return_value = '<form>filled</form>'
+
+        with patch.object(queue, 'request_confirmation',
+                          return_value=False) as mock_request:
+            service.get_user_confirmation(analysis_result, 'Test Broker', page)
+
+        html_path = tmp_path / 'test_broker.page.html'
+        assert html_path.read_text() == '<form>filled</form>'
+        details = mock_request.call_args.args[1]
+        assert details['html_path'] == str(html_path)
+
+
+@patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+class TestAnalyzeAndFillForm:
+    """Test form analysis and filling around the background mapping call."""
+
+    @patch('services.ai_fallback_service.fill_form_deterministically',
+           return_value={'filled': 1})
+    @patch('services.ai_fallback_service.analyze_form',
+           return_value={'fields': [{
+               'id': 'email',
+               'type': 'email'
+           }]})
+    def test_while_mapping_failure_does_not_fail_broker(
+            self, mock_analyze, mock_fill):
+        """Test an error in while_mapping still uses the finished mapping."""
+        service = AIFallbackService()
+        mapping = {'email': {'value': 'a@b.c', 'type': 'text'}}
+        service.ai_mapper = Mock()
+        service.ai_mapper.map_form_fields.return_value = mapping
+
+        result = service.analyze_and_fill_form(
+            {'name': 'Test Broker'}, {'email': 'a@b.c'},
+            Mock(),
+            while_mapping=Mock(side_effect=RuntimeError('no browser')))
+
+        assert result.success
+        assert result.field_mapping == mapping
+        mock_fill.assert_called_once()
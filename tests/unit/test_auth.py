@@ -0,0 +1,67 @@
+"""Tests for authentication token utilities and caching."""
+import base64
+import json
+import time
+from unittest.mock import Mock, patch
+
+from services.form_handler import FormHandler
+from utils.auth import get_jwt_expiry, is_jwt_valid
+
+
+def make_jwt(claims: dict) -> str:
+    """Build an unsigned JWT carrying the given claims."""
+
+    def encode(data: dict) -> str:
+        raw = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        return raw.rstrip('=')
+
+    return f"{encode({'alg': 'HS256'})}.{encode(claims)}.signature"
+
+
+class TestJwtExpiry:
+    """Test reading and checking JWT expiry."""
+
+    def test_expiry_is_read_from_claims(self):
+        """Test the exp claim is decoded from the token payload."""
+        assert get_jwt_expiry(make_jwt({'exp': 1700000000})) == 1700000000
+
+    def test_tokens_without_usable_expiry_are_invalid(self):
+        """Test missing, undecodable and expired tokens are not reused."""
+        assert get_jwt_expiry(make_jwt({'sub': 'user'})) is None
+        assert get_jwt_expiry('not-a-jwt') is None
+        assert not is_jwt_valid(None)
+        assert not is_jwt_valid(make_jwt({'exp': time.time() - 10}))
+        assert is_jwt_valid(make_jwt({'exp': time.time() + 3600}))
+
+
+class TestAuthTokenCache:
+    """Test FormHandler reuses extracted tokens across submissions."""
+
+    @patch('services.form_handler.extract_auth_tokens')
+    def test_valid_token_skips_extraction(self, mock_extract):
+        """Test a second submission to the same page reuses the JWT."""
+        token = make_jwt({'exp': time.time() + 3600})
+        mock_extract.return_value = {'jwtToken': token}
+        page = Mock(url='https://example.com/webform?step=1')
+        handler = FormHandler()
+
+        first = handler._extract_auth_tokens({'requires_jwt': True}, page)
+        page.url = 'https://example.com/webform?step=2'
+        second = handler._extract_auth_tokens({'requires_jwt': True}, page)
+
+        assert first == second == {'jwtToken': token}
+        mock_extract.assert_called_once()
+
+    @patch('services.form_handler.extract_auth_tokens')
+    def test_expired_token_is_extracted_again(self, mock_extract):
+        """Test tokens that are already expired are never cached."""
+        mock_extract.return_value = {
+            'jwtToken': make_jwt({'exp': time.time() - 10})
+        }
+        page = Mock(url='https://example.com/webform')
+        handler = FormHandler()
+
+        handler._extract_auth_tokens({'requires_jwt': True}, page)
+        handler._extract_auth_tokens({'requires_jwt': True}, page)
+
+        assert mock_extract.call_count == 2
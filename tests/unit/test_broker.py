@@ -0,0 +1,52 @@
+"""Tests for data broker utilities."""
+from unittest.mock import patch
+
+import pytest
+
+from utils.broker import (_get_broker_urls, get_broker_url, iter_broker_data,
+                          read_broker_data)
+
+
+@pytest.fixture
+def broker_list(tmp_path):
+    """Broker list CSV with one emailable and one form-only broker."""
+    csv_path = tmp_path / 'current.csv'
+    csv_path.write_text('name,website,email\n'
+                        'Spokeo,https://www.spokeo.com/optout,no email\n'
+                        'Acxiom,https://www.acxiom.com,privacy@acxiom.com\n')
+    with patch('utils.broker.BROKER_LIST_PATH', csv_path):
+        _get_broker_urls.cache_clear()
+        yield csv_path
+    _get_broker_urls.cache_clear()
+
+
+class TestGetBrokerUrl:
+    """Test looking up broker websites."""
+
+    def test_lookup_reads_list_once(self, broker_list):
+        """Test lookups are served from an index built on first use."""
+        assert get_broker_url('Spokeo') == 'https://www.spokeo.com/optout'
+        broker_list.unlink()
+
+        assert get_broker_url('Acxiom') == 'https://www.acxiom.com'
+        assert get_broker_url('Unknown') is None
+
+
+class TestReadBrokerData:
+    """Test reading the broker list CSV."""
+
+    def test_skips_brokers_without_email(self, broker_list):
+        """Test only brokers with a contact email are returned, as dicts."""
+        assert read_broker_data() == [{
+            'name': 'Acxiom',
+            'website': 'https://www.acxiom.com',
+            'email': 'privacy@acxiom.com'
+        }]
+
+    def test_iter_streams_rows(self, broker_list):
+        """Test the iterator yields rows lazily, one per broker."""
+        rows = iter_broker_data()
+
+        assert not isinstance(rows, list)
+        assert next(rows)['name'] == 'Acxiom'
+        assert next(rows, None) is None
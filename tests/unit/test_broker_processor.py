@@ -56,6 +56,44 @@ class TestBrokerProcessor:
         assert 'Minimal Broker' in config_names
         assert 'Full Broker' in config_names
 
+    def test_get_all_configurations_tags_flavor(self, temp_config_dir):
+        """Test loaded configs are tagged with their processing approach."""
+        processor = BrokerProcessor(temp_config_dir)
+        configs = {
+            config['name']: config
+            for config in processor.get_all_configurations()
+        }
+
+        assert configs['Minimal Broker']['_flavor'] == 'ai'
+        assert configs['Full Broker']['_flavor'] == 'deterministic'
+        assert processor.is_minimal_configuration(configs['Minimal Broker'])
+        assert not processor.is_minimal_configuration(configs['Full Broker'])
+
+    def test_get_all_configurations_reused_in_memory(self, temp_config_dir):
+        """Test repeat loads on one processor don't re-read the files."""
+        processor = BrokerProcessor(temp_config_dir)
+        first = processor.get_all_configurations()
+
+        with patch.object(processor, '_read_config_file') as mock_load:
+            second = processor.get_all_configurations()
+
+        mock_load.assert_not_called()
+        assert second is first
+
+    def test_get_all_configurations_reloaded_on_change(self, temp_config_dir):
+        """Test modified config files are re-read instead of reused."""
+        processor = BrokerProcessor(temp_config_dir)
+        processor.get_all_configurations()
+
+        (temp_config_dir / "extra.json").write_text(
+            json.dumps({
+                "name": "Extra Broker",
+                "type": "web_form"
+            }))
+        configs = processor.get_all_configurations()
+
+        assert 'Extra Broker' in [config['name'] for config in configs]
+
     def test_get_all_configurations_invalid_json(self, tmp_path):
         """Test error handling for invalid JSON."""
         config_dir = tmp_path / "bad_configs"
@@ -90,6 +128,39 @@ class TestBrokerProcessor:
 
         assert "Configuration missing 'name' field" in str(exc_info.value)
 
+    def test_get_all_configurations_schema_violation(self, tmp_path):
+        """Test configs that break the schema are rejected at load time."""
+        config_dir = tmp_path / "invalid_configs"
+        config_dir.mkdir()
+
+        config = {
+            "name": "Captcha Broker",
+            "type": "web_form",
+            "url": "https://example.com",
+            "form_config": {
+                "field_mappings": {
+                    "name": "first_name"
+                },
+                "submission": {
+                    "method": "api_post",
+                    "endpoint": "https://example.com/api",
+                    "requires_captcha": True,
+                    "payload_template": {},
+                    "headers": {}
+                }
+            }
+        }
+        (config_dir / "captcha.json").write_text(json.dumps(config))
+
+        processor = BrokerProcessor(config_dir)
+
+        with pytest.raises(BrokerConfigurationError) as exc_info:
+            processor.get_all_configurations()
+
+        assert "Invalid configuration in captcha.json" in str(exc_info.value)
+        assert "captcha_config" in str(exc_info.value)
+        assert exc_info.value.recovery_suggestions
+
     def test_filter_configurations_no_filter(self):
         """Test filter returns all configs when no filter specified."""
         processor = BrokerProcessor()
@@ -107,6 +178,21 @@ class TestBrokerProcessor:
         assert len(result) == 1
         assert result[0]["name"] == "Broker1"
 
+    def test_filter_configurations_index_reused(self, temp_config_dir):
+        """Test loaded configs are indexed once across filters."""
+        processor = BrokerProcessor(temp_config_dir)
+        configs = processor.get_all_configurations()
+
+        build = BrokerProcessor._build_name_index
+        with patch.object(BrokerProcessor, '_build_name_index',
+                          wraps=build) as mock_build:
+            first = processor.filter_configurations(configs, "minimal broker")
+            second = processor.filter_configurations(configs, "Full Broker")
+
+        assert first[0]["name"] == "Minimal Broker"
+        assert second[0]["name"] == "Full Broker"
+        mock_build.assert_called_once()
+
     def test_filter_configurations_not_found(self):
         """Test error when filtered broker not found."""
         processor = BrokerProcessor()
@@ -130,6 +216,28 @@ class TestBrokerProcessor:
         processor = BrokerProcessor()
         assert processor.is_minimal_configuration(full_broker_config) is False
 
+    def test_classify(self, minimal_broker_config, full_broker_config):
+        """Test configs are bucketed by processing approach in one pass."""
+        processor = BrokerProcessor()
+        email_config = {
+            "name": "Email Broker",
+            "type": "email_only",
+            "form_config": full_broker_config["form_config"]
+        }
+        no_url_config = {"name": "No URL Broker", "type": "web_form"}
+
+        buckets = processor.classify([
+            minimal_broker_config, full_broker_config, email_config,
+            no_url_config
+        ])
+
+        assert buckets == {
+            "deterministic_web": [full_broker_config],
+            "deterministic_email": [email_config],
+            "ai_fallback": [minimal_broker_config],
+            "invalid": [no_url_config]
+        }
+
     def test_get_processing_summary(self):
         """Test processing summary generation."""
         processor = BrokerProcessor()
@@ -0,0 +1,268 @@
+"""Tests for browser session utilities."""
+from unittest.mock import Mock, patch
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from utils import browser
+from utils.browser import (DISABLE_ANIMATIONS_SCRIPT, SUBMIT_BUTTON_SELECTOR,
+                           SUBMIT_SETTLE_TIMEOUT, SUBMIT_SUCCESS_SELECTOR,
+                           TRACKER_URL_PATTERN, BrowserSession, analyze_form,
+                           create_browser_context, fill_form_deterministically,
+                           select_option, submit_form, take_screenshot)
+
+
+class TestBrowserSession:
+    """Test BrowserSession context handling."""
+
+    def test_prewarmed_context_is_reused_once(self):
+        """Test new_context hands out a prewarmed context with same options."""
+        session = BrowserSession()
+        session._browser = Mock()
+        session._browser.new_context.side_effect = [Mock(), Mock(), Mock()]
+
+        session.prewarm_context()
+        spare = session._spare_context
+
+        assert session.new_context() is spare
+        assert session.new_context() is not spare
+        assert session._browser.new_context.call_count == 2
+
+    def test_prewarmed_context_not_used_for_other_options(self):
+        """Test a context blocking other resource types is not handed out."""
+        session = BrowserSession()
+        session._browser = Mock()
+        session._browser.new_context.side_effect = [Mock(), Mock()]
+
+        session.prewarm_context()
+        spare = session._spare_context
+
+        assert session.new_context(
+            blocked_resource_types=('image', )) is not spare
+        assert session._spare_context is spare
+
+    def test_browser_recycled_after_max_uses(self):
+        """Test the browser is closed once it has served max_uses contexts."""
+        session = BrowserSession(max_uses=2)
+        browser = session._browser = Mock()
+
+        session.release_context(Mock())
+        assert session._browser is browser
+
+        session.release_context(Mock())
+        browser.close.assert_called_once()
+        assert session._browser is None
+
+    def test_browser_recycled_after_unhealthy_context(self):
+        """Test an unhealthy context relaunches the browser right away."""
+        session = BrowserSession()
+        browser = session._browser = Mock()
+        context = Mock()
+
+        session.release_context(context, healthy=False)
+
+        context.close.assert_called_once()
+        browser.close.assert_called_once()
+        assert session._browser is None
+
+
+class TestCreateBrowserContext:
+    """Test standard browser context settings."""
+
+    def test_trackers_blocked(self):
+        """Test tracker requests are aborted on every context."""
+        context = create_browser_context(Mock())
+
+        context.route.assert_called_once()
+        pattern, handler = context.route.call_args.args
+        assert pattern is TRACKER_URL_PATTERN
+        assert pattern.search('https://www.google-analytics.com/collect')
+        assert not pattern.search('https://example.com/privacy-form')
+
+        route = Mock()
+        handler(route)
+        route.abort.assert_called_once()
+
+    def test_trackers_blocked_with_resource_types(self):
+        """Test the resource-type route doesn't let trackers through."""
+        context = create_browser_context(Mock(),
+                                         blocked_resource_types=('image', ))
+
+        def dispatch(url, resource_type):
+            # Playwright tries the most recently registered route first and
+            # moves on to the next one only when a handler falls back
+            route = Mock()
+            route.request.url = url
+            route.request.resource_type = resource_type
+            for call in reversed(context.route.call_args_list):
+                pattern, handler = call.args
+                if pattern == '**/*' or pattern.search(url):
+                    route.fallback.reset_mock()
+                    handler(route)
+                    if not route.fallback.called:
+                        break
+            return route
+
+        tracker = dispatch('https://www.google-analytics.com/collect',
+                           'script')
+        image = dispatch('https://example.com/logo.png', 'image')
+        form = dispatch('https://example.com/privacy-form', 'document')
+
+        tracker.abort.assert_called_once()
+        image.abort.assert_called_once()
+        form.abort.assert_not_called()
+        form.continue_.assert_not_called()
+
+    def test_animations_disabled(self):
+        """Test every page in the context gets the no-animation style."""
+        context = create_browser_context(Mock())
+
+        context.add_init_script.assert_called_once_with(
+            DISABLE_ANIMATIONS_SCRIPT)
+
+
+class TestTakeScreenshot:
+    """Test debug screenshot capture."""
+
+    def test_screenshot_saved_as_jpeg(self, tmp_path, mock_page):
+        """Test the viewport is captured as a JPEG and written to disk."""
+        with patch('utils.browser.ensure_screenshots_dir',
+                   return_value=tmp_path):
+            path = take_screenshot(mock_page, 'broker_form_submitted')
+            browser._screenshot_writer.submit(lambda: None).result()
+
+        mock_page.screenshot.assert_called_once_with(type='jpeg',
+                                                     quality=70,
+                                                     animations='disabled')
+        assert path.suffix == '.jpg'
+        assert path.read_bytes() == b"fake_screenshot"
+
+
+class TestAnalyzeForm:
+    """Test form analysis."""
+
+    def test_fields_and_button_read_in_one_call(self, mock_page):
+        """Test one evaluate call returns the fields and submit button."""
+        fields = [{'id': 'firstName', 'type': 'text'}]
+        mock_page.evaluate.return_value = {
+            'fields': fields,
+            'submitButton': {
+                'id': 'go',
+                'text': 'Submit'
+            }
+        }
+
+        result = analyze_form(mock_page)
+
+        mock_page.evaluate.assert_called_once()
+        mock_page.query_selector.assert_not_called()
+        assert result == {
+            'fields': fields,
+            'submit_button': {
+                'type': 'explicit',
+                'id': 'go',
+                'text': 'Submit',
+                'selector': SUBMIT_BUTTON_SELECTOR
+            }
+        }
+
+
+class TestSubmitForm:
+    """Test submitting a filled form."""
+
+    def test_waits_for_new_success_message(self, mock_page):
+        """Test submission waits on a message that wasn't there before."""
+        messages = mock_page.locator.return_value
+        messages.count.return_value = 1
+
+        submit_form(mock_page, {'selector': '#submit'})
+
+        mock_page.query_selector.return_value.click.assert_called_once()
+        mock_page.locator.assert_called_once_with(SUBMIT_SUCCESS_SELECTOR)
+        messages.nth.assert_called_once_with(1)
+        messages.nth.return_value.wait_for.assert_called_once_with(
+            timeout=SUBMIT_SETTLE_TIMEOUT)
+        mock_page.wait_for_load_state.assert_called_once_with('load')
+
+    def test_missing_success_message_is_not_an_error(self, mock_page):
+        """Test a page without a confirmation message still submits."""
+        messages = mock_page.locator.return_value
+        messages.count.return_value = 0
+        messages.nth.return_value.wait_for.side_effect = (
+            PlaywrightTimeoutError('no message'))
+
+        submit_form(mock_page, {'selector': '#submit'})
+
+
+class TestSelectOption:
+    """Test choosing an option in a custom dropdown."""
+
+    def test_listbox_options_read_from_located_field(self, mock_page):
+        """Test options are read and clicked through the located field."""
+        field = mock_page.query_selector.return_value
+        field.get_attribute.return_value = 'listbox'
+        field.evaluate.return_value = [{
+            'text': 'Alaska',
+            'index': 0
+        }, {
+            'text': 'California',
+            'index': 2
+        }]
+        option_elements = [Mock(), Mock(), Mock()]
+        field.query_selector_all.return_value = option_elements
+
+        select_option(mock_page, 'state"]', 'california')
+
+        script = field.evaluate.call_args.args[0]
+        assert 'state' not in script
+        mock_page.evaluate.assert_not_called()
+        option_elements[2].click.assert_called_once()
+        mock_page.click.assert_not_called()
+
+
+class TestFillFormDeterministically:
+    """Test filling a form from an AI field mapping."""
+
+    @patch('utils.browser.fill_form_field', return_value=True)
+    def test_plain_fields_filled_in_one_call(self, mock_fill, mock_page):
+        """Test fields share one evaluate and the rest fill one by one."""
+        mock_page.evaluate.return_value = ['first']
+        field_mapping = {
+            'first': {
+                'value': 'John',
+                'type': 'text'
+            },
+            'dob': {
+                'value': '01/15/1990',
+                'type': 'text'
+            },
+            'state': {
+                'value': 'California',
+                'type': 'autocomplete'
+            }
+        }
+
+        results = fill_form_deterministically(mock_page, field_mapping, {})
+
+        assert results == {'filled': 3, 'failed': 0, 'errors': []}
+        mock_page.evaluate.assert_called_once()
+        entries = mock_page.evaluate.call_args.args[1]
+        assert entries[0] == ['first', 'John', 'text']
+        assert entries[2] == ['state', 'California', 'autocomplete']
+        filled_one_by_one = []
+        for call in mock_fill.call_args_list:
+            filled_one_by_one.append(call.args[1])
+        assert filled_one_by_one == ['dob', 'state']
+
+    @patch('utils.browser.fill_form_field', return_value=True)
+    def test_batch_failure_falls_back(self, mock_fill, mock_page):
+        """Test a failing evaluate leaves every field to fill_form_field."""
+        mock_page.evaluate.side_effect = Exception('page navigated')
+
+        results = fill_form_deterministically(
+            mock_page, {'first': {
+                'value': 'John',
+                'type': 'text'
+            }}, {})
+
+        assert results['filled'] == 1
+        mock_fill.assert_called_once_with(mock_page, 'first', 'John', 'text')
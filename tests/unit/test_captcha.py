@@ -0,0 +1,68 @@
+"""Tests for CAPTCHA solving utilities."""
+from unittest.mock import patch
+
+from utils.captcha import (CAPTCHA_POLL_MAX_DELAY, _BackoffRecaptchaSolver,
+                           solve_captcha)
+
+
+def _task_result(status):
+    """Build a getTaskResult response."""
+    return {
+        'errorId': 0,
+        'status': status,
+        'solution': {
+            'gRecaptchaResponse': 'captcha-token'
+        }
+    }
+
+
+class TestBackoffRecaptchaSolver:
+    """Test polling for a solved CAPTCHA."""
+
+    @patch('utils.captcha.time.sleep')
+    def test_polls_with_growing_delay(self, mock_sleep):
+        """Test checks back off and stop once the task is solved."""
+        solver = _BackoffRecaptchaSolver()
+        responses = [_task_result('processing')] * 6 + [_task_result('ready')]
+
+        with patch.object(solver, 'make_request',
+                          side_effect=responses) as mock_request:
+            result = solver.wait_for_result()
+
+        assert result['solution']['gRecaptchaResponse'] == 'captcha-token'
+        assert mock_request.call_count == 7
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        assert delays[:3] == [1, 1.5, 2.25]
+        assert delays == sorted(delays)
+        assert delays[-1] == CAPTCHA_POLL_MAX_DELAY
+
+    @patch('utils.captcha.time.sleep')
+    def test_api_error_stops_polling(self, mock_sleep):
+        """Test an API error fails the solve without further checks."""
+        solver = _BackoffRecaptchaSolver()
+        error = {
+            'errorId': 12,
+            'errorCode': 'ERROR_CAPTCHA_UNSOLVABLE',
+            'errorDescription': 'Captcha could not be solved'
+        }
+
+        with patch.object(solver, 'make_request', return_value=error):
+            assert solver.wait_for_result() == 0
+
+        assert solver.error_code == 'ERROR_CAPTCHA_UNSOLVABLE'
+        mock_sleep.assert_not_called()
+
+
+class TestSolveCaptcha:
+    """Test the solve_captcha entry point."""
+
+    @patch.dict('os.environ', {'ANTICAPTCHA_API_KEY': 'test-key'})
+    @patch('utils.captcha.time.sleep')
+    @patch.object(_BackoffRecaptchaSolver, 'create_task', return_value=1)
+    @patch.object(_BackoffRecaptchaSolver,
+                  'make_request',
+                  return_value=_task_result('ready'))
+    def test_returns_token(self, mock_request, mock_create, mock_sleep):
+        """Test the solved token is returned."""
+        assert solve_captcha('https://example.com',
+                             'site-key') == 'captcha-token'
@@ -0,0 +1,267 @@
+"""Tests for the constrained AI form mapper."""
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from utils.constrained_ai import (ConstrainedFormMapper,
+                                  load_discovered_mappings,
+                                  save_discovered_config)
+
+
+@patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+class TestMappingPrompt:
+    """Test the prompt sent to the LLM."""
+
+    def test_fields_compact_and_fillable_only(self):
+        """Test fields are one line each, with only the keys mapping needs."""
+        fields = [{
+            'id': 'firstName',
+            'name': 'firstName',
+            'type': 'text',
+            'label': '',
+            'required': True,
+            'value': '',
+            'role': ''
+        }, {
+            'id': 'q1',
+            'name': 'lastName',
+            'type': 'text',
+            'label': 'Last name',
+            'required': False,
+            'value': 'Doe',
+            'role': ''
+        }, {
+            'id': 'csrf',
+            'name': 'csrf',
+            'type': 'hidden',
+            'label': '',
+            'required': False,
+            'value': 'token',
+            'role': ''
+        }]
+
+        prompt = ConstrainedFormMapper()._create_mapping_prompt(
+            {'fields': fields}, {'first_name': '<FIRST_NAME>'}, 'Test Broker')
+
+        assert '{"id":"firstName","type":"text"}\n' in prompt
+        assert ('{"id":"q1","name":"lastName","type":"text",'
+                '"label":"Last name"}\n') in prompt
+        assert 'csrf' not in prompt
+
+
+@patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+class TestMapFormFields:
+    """Test mapping form fields with the LLM."""
+
+    def test_requests_json_mode(self):
+        """Test the model is asked for a JSON object response."""
+        mapper = ConstrainedFormMapper()
+
+        assert mapper.llm.kwargs['response_format'] == {'type': 'json_object'}
+
+    def test_json_response_mapped_on_first_attempt(self):
+        """Test a JSON reply is validated and returned without retrying."""
+        mapper = ConstrainedFormMapper()
+        mapper.llm = Mock()
+        mapper.llm.invoke.return_value = Mock(
+            content='{"firstName": {"user_data_key": "first_name", '
+            '"field_type": "text"}}')
+
+        form_analysis = {'fields': [{'id': 'firstName'}]}
+
+        mapping = mapper.map_form_fields(form_analysis, {'first_name': 'John'},
+                                         'Test Broker')
+
+        assert mapping == {
+            'firstName': {
+                'value': 'John',
+                'type': 'text',
+                'user_key': 'first_name'
+            }
+        }
+        mapper.llm.invoke.assert_called_once()
+
+    def test_identical_form_reuses_mapping(self):
+        """Test a second broker with the same form skips the LLM."""
+        mapper = ConstrainedFormMapper()
+        mapper.llm = Mock()
+        mapper.llm.invoke.return_value = Mock(
+            content='{"firstName": {"user_data_key": "first_name", '
+            '"field_type": "text"}}')
+        form_analysis = {'fields': [{'id': 'firstName'}]}
+
+        mapper.map_form_fields(form_analysis, {'first_name': 'John'},
+                               'Broker A')
+        mapping = mapper.map_form_fields(form_analysis, {'first_name': 'Jane'},
+                                         'Broker B')
+        other_form = {'fields': [{'id': 'firstName'}, {'id': 'email'}]}
+        mapper.map_form_fields(other_form, {'first_name': 'John'}, 'Broker C')
+
+        assert mapping['firstName']['value'] == 'Jane'
+        assert mapper.llm.invoke.call_count == 2
+
+
+@patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+class TestFieldRules:
+    """Test mapping obvious fields without the LLM."""
+
+    @pytest.mark.parametrize("field, user_key", [
+        ({
+            'id': 'firstNameDSARElement'
+        }, 'first_name'),
+        ({
+            'id': 'emailAddress'
+        }, 'email'),
+        ({
+            'id': 'addressLine1'
+        }, 'address'),
+        ({
+            'id': 'address_line_2'
+        }, None),
+        ({
+            'id': 'q7',
+            'label': 'Date of Birth'
+        }, 'date_of_birth'),
+        ({
+            'id': 'ethnicity'
+        }, None),
+        ({
+            'id': 'fullName'
+        }, None),
+    ])
+    def test_match_field_rule(self, field, user_key):
+        """Test ids and labels are matched on whole words."""
+        assert ConstrainedFormMapper()._match_field_rule(field) == user_key
+
+    def test_obvious_form_skips_llm(self):
+        """Test a form of only recognizable fields is mapped locally."""
+        mapper = ConstrainedFormMapper()
+        mapper.llm = Mock()
+        fields = [{
+            'id': 'firstName',
+            'type': 'text'
+        }, {
+            'id': 'email',
+            'type': 'email'
+        }, {
+            'id': 'state',
+            'type': 'option'
+        }, {
+            'id': 'consent',
+            'type': 'checkbox'
+        }]
+        user_data = {
+            'first_name': 'John',
+            'email': 'j@example.com',
+            'state': 'CA'
+        }
+
+        mapping = mapper.map_form_fields({'fields': fields}, user_data,
+                                         'Test Broker')
+
+        assert mapping['firstName']['value'] == 'John'
+        assert mapping['email']['value'] == 'j@example.com'
+        assert mapping['state']['type'] == 'autocomplete'
+        mapper.llm.invoke.assert_not_called()
+
+    def test_only_unmatched_fields_sent_to_llm(self):
+        """Test the LLM sees just the leftover fields and results merge."""
+        mapper = ConstrainedFormMapper()
+        mapper.llm = Mock()
+        mapper.llm.invoke.return_value = Mock(
+            content='{"fullName": {"user_data_key": "first_name", '
+            '"field_type": "text"}}')
+        fields = [{
+            'id': 'email',
+            'type': 'email'
+        }, {
+            'id': 'fullName',
+            'type': 'text'
+        }]
+
+        mapping = mapper.map_form_fields({'fields': fields}, {
+            'first_name': 'John',
+            'email': 'j@example.com'
+        }, 'Test Broker')
+
+        prompt = mapper.llm.invoke.call_args.args[0]
+        assert '"id":"fullName"' in prompt
+        assert '"id":"email"' not in prompt
+        assert set(mapping) == {'email', 'fullName'}
+
+
+@patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+class TestSavedMappings:
+    """Test reusing mappings saved by an earlier run."""
+
+    FIELDS = [{'id': 'q1', 'type': 'text'}, {'id': 'q2', 'type': 'option'}]
+
+    def test_saved_config_reused_without_llm(self):
+        """Test a saved mapping that still fits the form skips the LLM."""
+        save_discovered_config('Test Broker', {
+            'form_config': {
+                'field_mappings': {
+                    'q1': 'first_name',
+                    'q2': 'state'
+                }
+            }
+        })
+        mapper = ConstrainedFormMapper()
+        mapper.llm = Mock()
+
+        mapping = mapper.map_form_fields({'fields': self.FIELDS}, {
+            'first_name': 'John',
+            'state': 'CA'
+        }, 'Test Broker', load_discovered_mappings('Test Broker'))
+
+        assert mapping['q1']['value'] == 'John'
+        assert mapping['q2']['type'] == 'autocomplete'
+        mapper.llm.invoke.assert_not_called()
+
+    def test_saved_date_field_filled_as_text(self):
+        """Test input types outside the name rules keep their mapping."""
+        mapper = ConstrainedFormMapper()
+        mapper.llm = Mock()
+        fields = [{
+            'id': 'dob',
+            'type': 'date'
+        }, {
+            'id': 'zip',
+            'type': 'number'
+        }]
+
+        mapping = mapper.map_form_fields({'fields': fields}, {
+            'date_of_birth': '01/15/1990',
+            'zip_code': '94105'
+        }, 'Test Broker', {
+            'dob': 'date_of_birth',
+            'zip': 'zip_code'
+        })
+
+        assert mapping['dob'] == {
+            'value': '01/15/1990',
+            'type': 'text',
+            'user_key': 'date_of_birth'
+        }
+        assert mapping['zip']['type'] == 'text'
+        mapper.llm.invoke.assert_not_called()
+
+    def test_stale_saved_mapping_falls_back_to_llm(self):
+        """Test a saved field missing from the form sends it to the LLM."""
+        mapper = ConstrainedFormMapper()
+        mapper.llm = Mock()
+        mapper.llm.invoke.return_value = Mock(
+            content='{"q1": {"user_data_key": "first_name", '
+            '"field_type": "text"}}')
+
+        mapping = mapper.map_form_fields({'fields': self.FIELDS},
+                                         {'first_name': 'John'}, 'Test Broker',
+                                         {'gone': 'first_name'})
+
+        mapper.llm.invoke.assert_called_once()
+        assert set(mapping) == {'q1'}
+
+    def test_missing_saved_config(self):
+        """Test brokers without a saved config have no mappings."""
+        assert load_discovered_mappings('Unknown Broker') is None
@@ -0,0 +1,127 @@
+"""Tests for FormHandler service."""
+from unittest.mock import Mock, patch
+
+import threading
+
+import orjson
+import pytest
+
+from services.form_handler import (HTTP_CONNECT_RETRIES, FormHandler,
+                                   FormSubmissionError, create_http_session)
+
+
+@pytest.fixture
+def captcha_broker_config(full_broker_config):
+    """Full broker configuration whose form requires a CAPTCHA."""
+    full_broker_config['form_config']['submission']['requires_captcha'] = True
+    full_broker_config['form_config']['submission']['payload_template'][
+        'recaptchaResponse'] = '{captcha_response}'
+    full_broker_config['captcha_config'] = {'website_key': 'site-key'}
+    return full_broker_config
+
+
+class TestFormHandler:
+    """Test FormHandler service."""
+
+    @patch('services.form_handler.extract_auth_tokens', return_value={})
+    def test_submit_web_form_serializes_with_orjson(self, mock_extract,
+                                                    full_broker_config,
+                                                    sample_user_data,
+                                                    mock_page):
+        """Test the payload is sent as JSON bytes and the response parsed."""
+        session = Mock()
+        session.post.return_value = Mock(
+            status_code=200,
+            headers={'content-type': 'application/json; charset=utf-8'},
+            content=b'{"requestId": "abc"}')
+        handler = FormHandler(session=session)
+
+        result = handler.submit_web_form(full_broker_config, sample_user_data,
+                                         mock_page)
+
+        _, kwargs = session.post.call_args
+        assert orjson.loads(kwargs['data'])['firstName'] == 'John'
+        assert kwargs['headers']['content-type'] == 'application/json'
+        assert 'Content-Type' not in kwargs['headers']
+        assert result.success is True
+        assert result.response_data == {'requestId': 'abc'}
+
+    @patch('services.form_handler.extract_auth_tokens', return_value={})
+    def test_submit_web_form_ignores_non_json_body(self, mock_extract,
+                                                   full_broker_config,
+                                                   sample_user_data,
+                                                   mock_page):
+        """Test a successful HTML response is not parsed as JSON."""
+        session = Mock()
+        session.post.return_value = Mock(status_code=200,
+                                         headers={'content-type': 'text/html'},
+                                         content=b'<html>Thanks</html>')
+        handler = FormHandler(session=session)
+
+        result = handler.submit_web_form(full_broker_config, sample_user_data,
+                                         mock_page)
+
+        assert result.success is True
+        assert result.response_data == {}
+
+    @patch('services.form_handler.extract_auth_tokens', return_value={})
+    @patch('services.form_handler.solve_captcha')
+    def test_captcha_solved_while_tokens_extracted(self, mock_solve,
+                                                   mock_extract,
+                                                   captcha_broker_config,
+                                                   sample_user_data,
+                                                   mock_page):
+        """Test the CAPTCHA solve runs alongside token extraction."""
+        extracting = threading.Event()
+
+        def solve(website_url, website_key):
+            # Only finishes if extraction starts before the solve is awaited
+            assert extracting.wait(timeout=5)
+            return 'captcha-token'
+
+        mock_solve.side_effect = solve
+        mock_extract.side_effect = lambda page: extracting.set() or {}
+        session = Mock()
+        session.post.return_value = Mock(status_code=200,
+                                         headers={},
+                                         content=b'')
+        handler = FormHandler(session=session)
+
+        captcha = handler.start_captcha(captcha_broker_config)
+        result = handler.submit_web_form(captcha_broker_config,
+                                         sample_user_data, mock_page, captcha)
+
+        assert result.success is True
+        mock_solve.assert_called_once_with(
+            'https://testbroker.com/privacy-form', 'site-key')
+        _, kwargs = session.post.call_args
+        assert orjson.loads(
+            kwargs['data'])['recaptchaResponse'] == 'captcha-token'
+
+    @patch('services.form_handler.extract_auth_tokens', return_value={})
+    @patch('services.form_handler.solve_captcha', return_value=None)
+    def test_failed_captcha_raises(self, mock_solve, mock_extract,
+                                   captcha_broker_config, sample_user_data,
+                                   mock_page):
+        """Test a failed solve is reported with recovery suggestions."""
+        handler = FormHandler(session=Mock())
+
+        with pytest.raises(FormSubmissionError) as exc_info:
+            handler.submit_web_form(captcha_broker_config, sample_user_data,
+                                    mock_page)
+
+        assert exc_info.value.recovery_suggestions
+        handler.session.post.assert_not_called()
+
+
+class TestCreateHttpSession:
+    """Test the shared HTTP session."""
+
+    def test_only_connection_failures_retried(self):
+        """Test connects are retried but a sent POST is never repeated."""
+        session = create_http_session()
+
+        retries = session.get_adapter('https://example.com').max_retries
+        assert retries.total == HTTP_CONNECT_RETRIES
+        assert retries.read == 0
+        assert not retries.status_forcelist
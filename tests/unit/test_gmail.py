@@ -0,0 +1,155 @@
+"""Tests for Gmail confirmation utilities."""
+import json
+import pickle
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+from google.oauth2.credentials import Credentials
+
+from utils.gmail import _get_default_gmail_service, check_confirmation_emails
+
+
+def _message(message_id, sender, subject, timestamp):
+    """Build a Gmail metadata message resource."""
+    return {
+        'id': message_id,
+        'internalDate': str(int(timestamp * 1000)),
+        'payload': {
+            'headers': [{
+                'name': 'From',
+                'value': sender
+            }, {
+                'name': 'Subject',
+                'value': subject
+            }]
+        }
+    }
+
+
+def _gmail_service(messages):
+    """Mock Gmail service serving messages through list and batch calls."""
+    service = Mock()
+    service.users().messages().list().execute.return_value = {
+        'messages': [{
+            'id': m['id']
+        } for m in messages]
+    }
+    by_id = {m['id']: m for m in messages}
+
+    def new_batch(callback):
+        batch = Mock()
+        added = []
+        batch.add.side_effect = lambda request, request_id: added.append(
+            request_id)
+        batch.execute.side_effect = lambda: [
+            callback(request_id, by_id[request_id], None)
+            for request_id in added
+        ]
+        return batch
+
+    service.new_batch_http_request.side_effect = new_batch
+    return service
+
+
+class TestCheckConfirmationEmails:
+    """Test batched confirmation email checks."""
+
+    def test_routes_messages_to_brokers(self):
+        """Test each broker is matched by sender domain and timestamp."""
+        service = _gmail_service([
+            _message('1', 'Privacy <noreply@onetrust.com>',
+                     'Your privacy request was received', 2000),
+            _message('2', 'news@other.com', 'Confirmation', 2000),
+            _message('3', 'help@spokeo.com', 'Request ID 42', 500),
+        ])
+
+        result = check_confirmation_emails(service,
+                                           'john.doe@example.com', {
+                                               'Acxiom': ['onetrust.com'],
+                                               'Spokeo': ['spokeo.com']
+                                           }, {
+                                               'Acxiom': 1000,
+                                               'Spokeo': 1000
+                                           },
+                                           wait_time=1,
+                                           check_interval=0)
+
+        assert result == {'Acxiom': True, 'Spokeo': False}
+        assert service.new_batch_http_request.called
+
+    def test_no_domains_skips_gmail(self):
+        """Test brokers without domains are reported unconfirmed."""
+        service = Mock()
+
+        result = check_confirmation_emails(service, 'john.doe@example.com',
+                                           {'Acxiom': []}, {'Acxiom': 1000})
+
+        assert result == {'Acxiom': False}
+        service.users.assert_not_called()
+
+
+class TestDefaultGmailService:
+    """Test loading stored Gmail credentials."""
+
+    @staticmethod
+    def _credentials(token, expiry):
+        """Build authorized user credentials."""
+        return Credentials(token,
+                           refresh_token='refresh-token',
+                           token_uri='https://oauth2.googleapis.com/token',
+                           client_id='client-id',
+                           client_secret='client-secret',
+                           expiry=expiry)
+
+    @patch('utils.gmail.build')
+    def test_token_near_expiry_refreshed_and_saved(self, mock_build, tmp_path,
+                                                   monkeypatch):
+        """Test a token about to expire is refreshed and written back."""
+        monkeypatch.chdir(tmp_path)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        creds = self._credentials('old-token', now + timedelta(minutes=2))
+        (tmp_path / 'token.json').write_text(creds.to_json())
+
+        def refresh(self, request):
+            self.token = 'new-token'
+            self.expiry = now + timedelta(hours=1)
+
+        with patch.object(Credentials, 'refresh', refresh):
+            _get_default_gmail_service.__wrapped__()
+
+        saved = json.loads((tmp_path / 'token.json').read_text())
+        assert saved['token'] == 'new-token'
+        assert not (tmp_path / 'token.json.tmp').exists()
+        mock_build.assert_called_once()
+
+    @patch('utils.gmail.build')
+    def test_token_without_refresh_used_until_expiry(self, mock_build,
+                                                     tmp_path, monkeypatch):
+        """Test a valid token that can't be refreshed skips the OAuth flow."""
+        monkeypatch.chdir(tmp_path)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        # Inside TOKEN_REFRESH_MARGIN but still valid to google-auth
+        creds = self._credentials('token',
+                                  now + timedelta(minutes=4, seconds=30))
+        creds._refresh_token = None
+        (tmp_path / 'token.pickle').write_bytes(pickle.dumps(creds))
+
+        with patch.object(Credentials, 'refresh') as mock_refresh:
+            _get_default_gmail_service.__wrapped__()
+
+        mock_refresh.assert_not_called()
+        mock_build.assert_called_once()
+
+    @patch('utils.gmail.build')
+    def test_pickled_token_migrated_to_json(self, mock_build, tmp_path,
+                                            monkeypatch):
+        """Test a token.pickle from older versions is converted once."""
+        monkeypatch.chdir(tmp_path)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        creds = self._credentials('token', now + timedelta(hours=1))
+        (tmp_path / 'token.pickle').write_bytes(pickle.dumps(creds))
+
+        _get_default_gmail_service.__wrapped__()
+
+        saved = json.loads((tmp_path / 'token.json').read_text())
+        assert saved['token'] == 'token'
@@ -0,0 +1,38 @@
+"""Tests for state validation utilities."""
+import pytest
+
+from utils.state_utils import (STATE_MAPPING, StateHandler,
+                               validate_state_input)
+
+
+class TestValidateStateInput:
+    """Test state lookup by code, name and common variations."""
+
+    @pytest.mark.parametrize("state, expected", [
+        ("CA", "CA"),
+        (" ny ", "NY"),
+        ("new hampshire", "NH"),
+        ("District of Columbia", "DC"),
+        ("Washington DC", "DC"),
+        ("d.c.", "DC"),
+    ])
+    def test_valid_states(self, state, expected):
+        """Test codes, names and variations resolve case-insensitively."""
+        assert validate_state_input(state) == expected
+
+    def test_invalid_state(self):
+        """Test unknown states list the valid choices."""
+        with pytest.raises(ValueError) as exc_info:
+            validate_state_input("Atlantis")
+
+        assert "Invalid state 'Atlantis'" in str(exc_info.value)
+        assert "2-letter code:" in str(exc_info.value)
+
+    def test_state_handler_full_format(self):
+        """Test StateHandler formats a code as the full name."""
+        assert StateHandler('full').format_state('tx') == 'Texas'
+
+    def test_state_tables_are_read_only(self):
+        """Test the shared state tables cannot drift from the lookup."""
+        with pytest.raises(TypeError):
+            STATE_MAPPING['XX'] = 'Nowhere'
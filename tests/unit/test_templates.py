@@ -0,0 +1,55 @@
+"""Tests for template substitution utilities."""
+from utils.templates import (CompiledString, StaticValue, compile_template,
+                             substitute_template_variables)
+
+
+class TestTemplates:
+    """Test raw and pre-compiled template substitution."""
+
+    def test_compiled_matches_raw_substitution(self, sample_user_data):
+        """Test compiled templates render the same payload as raw ones."""
+        template = {
+            "name": "{first_name} {last_name}",
+            "contact": ["{email}", "static"],
+            "flags": {
+                "captcha": False,
+                "state": "{state}"
+            }
+        }
+
+        compiled = compile_template(template)
+
+        assert isinstance(compiled["name"], CompiledString)
+        assert compiled["contact"][1] == "static"
+        assert substitute_template_variables(
+            compiled, sample_user_data) == substitute_template_variables(
+                template, sample_user_data)
+        assert substitute_template_variables(
+            compiled, sample_user_data)["name"] == "John Doe"
+
+    def test_unknown_variables_are_preserved(self):
+        """Test variables missing from user data are left in place."""
+        compiled = compile_template({"token": "{captcha_response}"})
+
+        result = substitute_template_variables(compiled, {"first_name": "J"})
+
+        assert result == {"token": "{captcha_response}"}
+
+    def test_static_subtrees_are_shared(self, sample_user_data):
+        """Test nested values without variables aren't rebuilt per render."""
+        template = {
+            "email": "{email}",
+            "webformConfig": {
+                "id": "static-uuid",
+                "steps": [1, 2]
+            }
+        }
+
+        compiled = compile_template(template)
+        first = substitute_template_variables(compiled, sample_user_data)
+        second = substitute_template_variables(compiled, sample_user_data)
+
+        assert isinstance(compiled["webformConfig"], StaticValue)
+        assert first["webformConfig"] is template["webformConfig"]
+        assert second["webformConfig"] is first["webformConfig"]
+        assert first is not second
@@ -0,0 +1,36 @@
+"""Tests for the utils package's lazy re-exports."""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import utils
+
+
+class TestLazyExports:
+    """Test names are loaded from their submodules on first use."""
+
+    def test_all_names_resolve(self):
+        """Test every name in __all__ has a submodule and resolves."""
+        assert sorted(utils.__all__) == sorted(utils._NAME_MODULES)
+        for name in utils.__all__:
+            assert getattr(utils, name) is not None
+
+    def test_unknown_name_raises(self):
+        """Test an unknown attribute still raises AttributeError."""
+        with pytest.raises(AttributeError):
+            utils.not_a_utility
+
+    def test_light_import_skips_heavy_dependencies(self):
+        """Test importing one helper doesn't load Playwright or Gmail."""
+        code = ('import sys, utils.validation; '
+                'print("utils.gmail" in sys.modules, '
+                '"playwright" in sys.modules)')
+        output = subprocess.run([sys.executable, '-c', code],
+                                cwd=Path(utils.__file__).parent.parent,
+                                capture_output=True,
+                                text=True,
+                                check=True).stdout
+
+        assert output.split() == ['False', 'False']
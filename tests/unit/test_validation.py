@@ -0,0 +1,31 @@
+"""Tests for user input validation."""
+import pytest
+
+from utils.validation import validate_date_of_birth
+
+
+class TestValidateDateOfBirth:
+    """Test date of birth parsing and formatting."""
+
+    @pytest.mark.parametrize("date_str, expected", [
+        ("01/15/1990", "01/15/1990"),
+        ("1/5/1990", "01/05/1990"),
+        ("02/29/2000", "02/29/2000"),
+    ])
+    def test_valid_dates(self, date_str, expected):
+        """Test valid dates are zero-padded to MM/DD/YYYY."""
+        assert validate_date_of_birth(date_str) == expected
+
+    @pytest.mark.parametrize("date_str", [
+        "1990-01-15", "13/01/1990", "02/30/1990", "01/15/90", "a/b/cdef",
+        "1\u00b2/01/1990", "01/01/\u0661\u0669\u0669\u0660"
+    ])
+    def test_invalid_format(self, date_str):
+        """Test malformed and impossible dates are rejected."""
+        with pytest.raises(ValueError, match="MM/DD/YYYY"):
+            validate_date_of_birth(date_str)
+
+    def test_future_date(self):
+        """Test dates in the future are rejected."""
+        with pytest.raises(ValueError, match="future"):
+            validate_date_of_birth("01/01/2999")
@@ -1,28 +1,55 @@
-"""Utility modules for data deletion automation."""
+"""Utility modules for data deletion automation.
+
+Submodules are imported the first time one of their names is used, so
+importing a light helper such as broker_log doesn't also load Playwright,
+the Google API client and the CAPTCHA solver.
+"""
+import importlib
+
+# Submodule each re-exported name is loaded from
+_EXPORTS = {
+    'gmail':
+    ('get_gmail_service', 'ensure_label_exists', 'create_deletion_email',
+     'send_email', 'check_confirmation_email', 'check_confirmation_emails'),
+    'browser':
+    ('BrowserSession', 'create_browser_context', 'ensure_screenshots_dir',
+     'set_screenshots_enabled', 'take_screenshot', 'navigate_to_form',
+     'analyze_form', 'fill_form_field', 'submit_form',
+     'fill_form_deterministically'),
+    'broker': ('get_broker_url', 'read_broker_data', 'iter_broker_data',
+               'get_broker_email_domains', 'ACXIOM_DELETE_FORM_URL',
+               'ACXIOM_OPTOUT_URL', 'load_broker_config', 'prepare_user_data'),
+    'captcha': ('solve_captcha', ),
+    'state_utils': ('validate_state_input', 'get_state_format', 'StateHandler',
+                    'STATE_MAPPING'),
+    'auth': ('extract_auth_tokens', 'get_jwt_expiry', 'is_jwt_valid'),
+    'validation': ('validate_date_of_birth', ),
+    'templates': ('substitute_template_variables', 'compile_template'),
+    'broker_log': ('get_broker_logger', 'buffered_broker_output',
+                   'flush_broker_output', 'with_broker_output'),
+}
+
+_NAME_MODULES = {}
+for _module, _names in _EXPORTS.items():
+    for _name in _names:
+        _NAME_MODULES[_name] = _module
+del _module, _names, _name
+
+
+def __getattr__(name):
+    """Import the submodule defining a re-exported name on first access."""
+    module = _NAME_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_NAME_MODULES))
 
-from .gmail import (get_gmail_service, ensure_label_exists,
-                    create_deletion_email, send_email,
-                    check_confirmation_email)
-
-from .browser import (create_browser_context, ensure_screenshots_dir,
-                      take_screenshot, analyze_form, fill_form_field,
-                      submit_form, wait_for_navigation,
-                      fill_form_deterministically)
-
-from .broker import (get_broker_url, read_broker_data,
-                     get_broker_email_domains, ACXIOM_DELETE_FORM_URL,
-                     ACXIOM_OPTOUT_URL, load_broker_config, prepare_user_data)
-
-from .captcha import (solve_captcha)
-
-from .state_utils import (validate_state_input, get_state_format, StateHandler,
-                          STATE_MAPPING)
-
-from .auth import (extract_auth_tokens)
-
-from .validation import (validate_date_of_birth)
-
-from .templates import (substitute_template_variables)
 
 __all__ = [
     # Gmail utilities
@@ -31,20 +58,24 @@ __all__ = [
     'create_deletion_email',
     'send_email',
     'check_confirmation_email',
+    'check_confirmation_emails',
 
     # Browser utilities
+    'BrowserSession',
     'create_browser_context',
     'ensure_screenshots_dir',
+    'set_screenshots_enabled',
     'take_screenshot',
+    'navigate_to_form',
     'analyze_form',
     'fill_form_field',
     'submit_form',
-    'wait_for_navigation',
     'fill_form_deterministically',
 
     # Broker utilities
     'get_broker_url',
     'read_broker_data',
+    'iter_broker_data',
     'get_broker_email_domains',
     'ACXIOM_DELETE_FORM_URL',
     'ACXIOM_OPTOUT_URL',
@@ -62,10 +93,19 @@ __all__ = [
 
     # Auth utilities
     'extract_auth_tokens',
+    'get_jwt_expiry',
+    'is_jwt_valid',
 
     # Validation utilities
     'validate_date_of_birth',
 
     # Template utilities
-    'substitute_template_variables'
+    'substitute_template_variables',
+    'compile_template',
+
+    # Logging utilities
+    'get_broker_logger',
+    'buffered_broker_output',
+    'flush_broker_output',
+    'with_broker_output'
 ]
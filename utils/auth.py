@@ -1,5 +1,47 @@
 """Authentication token extraction utilities."""
-from typing import Dict
+import base64
+import json
+import time
+from typing import Dict, Optional
+
+# Treat tokens this close to expiry as expired so a request can't race it
+JWT_EXPIRY_LEEWAY = 60
+
+
+def get_jwt_expiry(token: str) -> Optional[float]:
+    """Read the expiry time from a JWT without verifying its signature.
+
+    Args:
+        token: Encoded JWT
+
+    Returns:
+        Unix timestamp of the token's exp claim, or None if it has none or
+        the token cannot be decoded
+    """
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return float(claims['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def is_jwt_valid(token: Optional[str],
+                 leeway: int = JWT_EXPIRY_LEEWAY) -> bool:
+    """Check whether a JWT has a known expiry that is still in the future.
+
+    Args:
+        token: Encoded JWT
+        leeway: Seconds before expiry at which the token counts as expired
+
+    Returns:
+        True if the token can still be used, False otherwise
+    """
+    if not token:
+        return False
+    expiry = get_jwt_expiry(token)
+    return expiry is not None and expiry - leeway > time.time()
 
 
 def extract_auth_tokens(page) -> Dict:
@@ -13,6 +55,9 @@ def extract_auth_tokens(page) -> Dict:
     """
     return page.evaluate('''() => {
         const auth = {};
+        // First JWT-shaped substring; non-global so the scan stops there
+        const JWT_PATTERN = /eyJ[a-zA-Z0-9_-]+\\.[a-zA-Z0-9_-]+\\.[a-zA-Z0-9_-]+/;
+        const looksLikeJwt = value => value.startsWith('eyJ') && value.split('.').length === 3;
         
         // 1. Look for JWT tokens in hidden inputs
         const hiddenInputs = document.querySelectorAll('input[type="hidden"]');
@@ -20,7 +65,7 @@ def extract_auth_tokens(page) -> Dict:
             if (input.name && input.value) {
                 auth[input.name] = input.value;
                 // Check if it looks like a JWT token
-                if (input.value.startsWith('eyJ') && input.value.split('.').length === 3) {
+                if (looksLikeJwt(input.value)) {
                     auth.jwtToken = input.value;
                     auth.jwtTokenSource = `input.${input.name}`;
                 }
@@ -34,7 +79,7 @@ def extract_auth_tokens(page) -> Dict:
             const content = meta.getAttribute('content');
             if (name && content) {
                 auth[`meta_${name}`] = content;
-                if (content.startsWith('eyJ') && content.split('.').length === 3) {
+                if (looksLikeJwt(content)) {
                     auth.jwtToken = content;
                     auth.jwtTokenSource = `meta.${name}`;
                 }
@@ -46,7 +91,7 @@ def extract_auth_tokens(page) -> Dict:
             for (let i = 0; i < localStorage.length; i++) {
                 const key = localStorage.key(i);
                 const value = localStorage.getItem(key);
-                if (value && value.startsWith('eyJ') && value.split('.').length === 3) {
+                if (value && looksLikeJwt(value)) {
                     auth.jwtToken = value;
                     auth.jwtTokenSource = `localStorage.${key}`;
                 }
@@ -61,7 +106,7 @@ def extract_auth_tokens(page) -> Dict:
             for (let i = 0; i < sessionStorage.length; i++) {
                 const key = sessionStorage.key(i);
                 const value = sessionStorage.getItem(key);
-                if (value && value.startsWith('eyJ') && value.split('.').length === 3) {
+                if (value && looksLikeJwt(value)) {
                     auth.jwtToken = value;
                     auth.jwtTokenSource = `sessionStorage.${key}`;
                 }
@@ -76,10 +121,10 @@ def extract_auth_tokens(page) -> Dict:
         scripts.forEach(script => {
             const content = script.textContent || script.innerHTML;
             if (content) {
-                // Look for JWT patterns in script content
-                const jwtMatches = content.match(/eyJ[a-zA-Z0-9_-]+\\.[a-zA-Z0-9_-]+\\.[a-zA-Z0-9_-]+/g);
-                if (jwtMatches) {
-                    auth.jwtToken = jwtMatches[0];
+                // Look for a JWT pattern in script content
+                const jwtMatch = JWT_PATTERN.exec(content);
+                if (jwtMatch) {
+                    auth.jwtToken = jwtMatch[0];
                     auth.jwtTokenSource = 'script_content';
                 }
             }
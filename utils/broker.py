@@ -1,13 +1,27 @@
 """Data broker utility functions for data deletion automation."""
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
 from pathlib import Path
 import csv
 import json
+from .broker_log import get_broker_logger
+from .state_utils import StateHandler
+
+logger = get_broker_logger()
 
 # Broker-specific constants
 ACXIOM_DELETE_FORM_URL = "https://privacyportal.onetrust.com/webform/342ca6ac-4177-4827-b61e-19070296cbd3/7229a09c-578f-4ac6-a987-e0428a7b877e"
 ACXIOM_OPTOUT_URL = "https://www.acxiom.com/optout/"
 
+# CSV listing each broker's name, website and contact email
+BROKER_LIST_PATH = Path(__file__).parent.parent / 'broker_lists' / 'current.csv'
+
+# Map of broker names to their email domains
+BROKER_EMAIL_DOMAINS = {
+    'Acxiom': ['acxiom.com', 'onetrust.com'],
+    # Add more brokers as needed
+}
+
 def get_broker_url(broker_name: str) -> Optional[str]:
     """Get the form URL for a specific broker.
     
@@ -17,15 +31,36 @@ def get_broker_url(broker_name: str) -> Optional[str]:
     Returns:
         URL for the broker's form, or None if not found
     """
-    script_dir = Path(__file__).parent.parent
-    csv_path = script_dir / 'broker_lists' / 'current.csv'
+    return _get_broker_urls().get(broker_name)
 
-    with open(csv_path, 'r') as f:
+@lru_cache(maxsize=1)
+def _get_broker_urls() -> Dict[str, str]:
+    """Read the broker list once and index each broker's website by name."""
+    urls = {}
+    with open(BROKER_LIST_PATH, 'r') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            if row['name'] == broker_name:
-                return row['website']
-    return None
+            # Keep the first row for a name, as a linear scan would
+            urls.setdefault(row['name'], row['website'])
+    return urls
+
+def iter_broker_data() -> Iterator[Dict[str, str]]:
+    """Stream data broker information from the CSV file.
+
+    Rows are parsed one at a time, so callers that handle brokers one by
+    one never hold the whole list in memory.
+
+    Yields:
+        Dictionary containing one broker's information
+    """
+    with open(BROKER_LIST_PATH, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        email_index = header.index('email')
+        for row in reader:
+            # Filter on the raw row so skipped brokers never get a dict built
+            if len(row) > email_index and row[email_index] != 'no email':
+                yield dict(zip(header, row))
 
 def read_broker_data() -> List[Dict[str, str]]:
     """Read data broker information from CSV file.
@@ -33,16 +68,7 @@ def read_broker_data() -> List[Dict[str, str]]:
     Returns:
         List of dictionaries containing broker information
     """
-    script_dir = Path(__file__).parent.parent
-    csv_path = script_dir / 'broker_lists' / 'current.csv'
-
-    brokers = []
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row['email'] != 'no email':
-                brokers.append(row)
-    return brokers
+    return list(iter_broker_data())
 
 def get_broker_email_domains(broker_name: str) -> List[str]:
     """Get the email domains associated with a broker.
@@ -53,12 +79,7 @@ def get_broker_email_domains(broker_name: str) -> List[str]:
     Returns:
         List of email domains to monitor for confirmations
     """
-    # Map of broker names to their email domains
-    broker_domains = {
-        'Acxiom': ['acxiom.com', 'onetrust.com'],
-        # Add more brokers as needed
-    }
-    return broker_domains.get(broker_name, [])
+    return BROKER_EMAIL_DOMAINS.get(broker_name, [])
 
 
 def load_broker_config(broker_name: str) -> Dict:
@@ -95,8 +116,6 @@ def prepare_user_data(config: Dict, **kwargs) -> Dict:
     Returns:
         Dictionary with properly formatted user data
     """
-    from .state_utils import StateHandler
-    
     user_data = {}
     
     # Copy basic fields
@@ -109,6 +128,6 @@ def prepare_user_data(config: Dict, **kwargs) -> Dict:
         state_format = config.get('form_config', {}).get('state_format', 'full')
         state_handler = StateHandler(state_format)
         user_data['state'] = state_handler.format_state(user_data['state'])
-        print(f"Formatted state as: {user_data['state']} (format: {state_format})")
+        logger.info(f"Formatted state as: {user_data['state']} (format: {state_format})")
     
     return user_data
@@ -0,0 +1,114 @@
+"""Buffered console output for brokers processed concurrently."""
+import functools
+import logging
+import sys
+import threading
+from contextlib import contextmanager
+from logging.handlers import MemoryHandler
+from typing import Callable, Iterator, Optional
+
+# Serializes console writes so each broker's output is printed contiguously
+_output_lock = threading.RLock()
+
+# Output buffer of the broker being processed on the current thread, if any
+_thread_state = threading.local()
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Stream handler that never interleaves with a flushing broker buffer."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        with _output_lock:
+            super().emit(record)
+
+
+class _BrokerBuffer(MemoryHandler):
+    """Buffers one broker's records and writes them out as a single block."""
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        # Errors are buffered too; only a full buffer forces an early flush
+        return len(self.buffer) >= self.capacity
+
+    def flush(self) -> None:
+        with _output_lock:
+            super().flush()
+
+
+class _RoutingHandler(logging.Handler):
+    """Sends records to the current thread's broker buffer or the console."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        buffer = getattr(_thread_state, 'buffer', None)
+        (buffer or _console_handler).handle(record)
+
+
+_console_handler = _ConsoleHandler(sys.stdout)
+_console_handler.setFormatter(logging.Formatter('%(message)s'))
+
+_root_logger = logging.getLogger('broker')
+_root_logger.setLevel(logging.INFO)
+_root_logger.propagate = False
+_root_logger.addHandler(_RoutingHandler())
+
+
+def get_broker_logger(broker_name: Optional[str] = None) -> logging.Logger:
+    """Get the logger for user-facing broker processing output.
+
+    Args:
+        broker_name: Broker the messages belong to, if known
+
+    Returns:
+        Logger whose records are buffered while a broker is processed
+    """
+    if broker_name:
+        return logging.getLogger(f"broker.{broker_name}")
+    return _root_logger
+
+
+@contextmanager
+def buffered_broker_output(capacity: int = 1000) -> Iterator[None]:
+    """Buffer broker log output on this thread and emit it as one block.
+
+    Args:
+        capacity: Number of records buffered before an early flush
+    """
+    buffer = _BrokerBuffer(capacity, target=_console_handler)
+    _thread_state.buffer = buffer
+    try:
+        yield
+    finally:
+        _thread_state.buffer = None
+        buffer.close()
+
+
+def flush_broker_output() -> None:
+    """Write out the current thread's buffered output, e.g. before a prompt."""
+    buffer = getattr(_thread_state, 'buffer', None)
+    if buffer is not None:
+        buffer.flush()
+
+
+def with_broker_output(func: Callable) -> Callable:
+    """Bind a callable to the current thread's broker output buffer.
+
+    Use when handing broker work to another thread so its output still lands
+    in the broker's block.
+
+    Args:
+        func: Callable to run on another thread
+
+    Returns:
+        Callable that logs into this thread's buffer while it runs
+    """
+    buffer = getattr(_thread_state, 'buffer', None)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = getattr(_thread_state, 'buffer', None)
+        _thread_state.buffer = buffer
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _thread_state.buffer = previous
+
+    return wrapper
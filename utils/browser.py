@@ -1,26 +1,105 @@
 """Browser automation utility functions for data deletion automation."""
 import logging
-from typing import Dict, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
 from pathlib import Path
 from datetime import datetime
-from playwright.sync_api import Page, Browser, BrowserContext, ElementHandle
+from playwright.sync_api import (Page, Browser, BrowserContext, ElementHandle,
+                                 TimeoutError as PlaywrightTimeoutError,
+                                 sync_playwright)
 from difflib import get_close_matches
+from .broker_log import get_broker_logger
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+broker_logger = get_broker_logger()
 
+# Chromium features form automation never uses; skipping them saves CPU and
+# memory per browser, leaving room for more concurrent brokers
+LEAN_BROWSER_ARGS = ('--disable-extensions', '--disable-gpu',
+                     '--disable-dev-shm-usage',
+                     '--disable-background-networking')
 
-def create_browser_context(browser: Browser) -> BrowserContext:
+# Resource types that form automation never needs
+NON_ESSENTIAL_RESOURCE_TYPES = ('image', 'media', 'font')
+
+# Turns off CSS animations and transitions on every page, so Playwright's
+# actionability checks don't wait for fades and slide-ins to finish
+DISABLE_ANIMATIONS_SCRIPT = '''document.addEventListener('DOMContentLoaded', () => {
+    const style = document.createElement('style');
+    style.textContent = '*, *::before, *::after { animation: none !important; transition: none !important; }';
+    (document.head || document.documentElement).appendChild(style);
+});'''
+
+# Analytics and marketing hosts that opt-out pages load but forms never need;
+# matched by Playwright itself, so unless resource types are blocked too,
+# other requests never reach Python
+TRACKER_URL_PATTERN = re.compile(
+    r'^https?://([^/?#]+\.)?(googletagmanager\.com|google-analytics\.com|'
+    r'doubleclick\.net|facebook\.net|hotjar\.com|segment\.io|'
+    r'fullstory\.com)[/:?#]')
+
+# Selector that signals a form page is ready when no better one is configured
+DEFAULT_READY_SELECTOR = 'form, input, button'
+
+# Submit buttons analyze_form looks for; :has-text is Playwright-only syntax
+SUBMIT_BUTTON_SELECTOR = (
+    'button[type="submit"], input[type="submit"], button:has-text("Submit")')
+
+# Milliseconds to wait for a confirmation message after a form submission
+SUBMIT_SETTLE_TIMEOUT = 5000
+
+# Mapped field types fill_form_deterministically sets in a single evaluate
+BATCH_FILL_TYPES = ('text', 'textarea', 'select', 'autocomplete')
+
+# Text most brokers show once a request has been accepted
+SUBMIT_SUCCESS_SELECTOR = 'text=/thank you|submitted|received/i'
+
+# Elements select_option treats as candidate options inside a listbox
+LISTBOX_OPTION_SELECTOR = '[role="option"], div, li, span'
+
+# Contexts a browser serves before it is relaunched, bounding the memory a
+# long-lived browser accumulates across many brokers
+DEFAULT_MAX_CONTEXT_USES = 50
+
+# JPEG quality for debug screenshots; far smaller than PNG and still legible
+SCREENSHOT_JPEG_QUALITY = 70
+
+# Screenshots are written to disk here so page work doesn't wait on I/O;
+# the interpreter joins the thread at exit, so queued writes still complete
+_screenshot_writer = ThreadPoolExecutor(max_workers=1,
+                                        thread_name_prefix='screenshot-writer')
+_screenshots_enabled = True
+
+
+def set_screenshots_enabled(enabled: bool) -> None:
+    """Turn debug screenshots on or off for the whole process.
+
+    Args:
+        enabled: Whether take_screenshot should capture anything
+    """
+    global _screenshots_enabled
+    _screenshots_enabled = enabled
+
+
+def create_browser_context(
+    browser: Browser, blocked_resource_types: Iterable[str] = ()
+) -> BrowserContext:
     """Create a new browser context with standard settings.
 
+    Requests to known trackers (TRACKER_URL_PATTERN) are always aborted, and
+    CSS animations are disabled on every page.
+
     Args:
         browser: Playwright browser instance
+        blocked_resource_types: Resource types (e.g. 'image') to abort
 
     Returns:
         Browser context with standard settings
     """
-    return browser.new_context(
+    context = browser.new_context(
         viewport={
             'width': 1366,
             'height': 768
@@ -29,6 +108,144 @@ def create_browser_context(browser: Browser) -> BrowserContext:
         'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
     )
 
+    context.add_init_script(DISABLE_ANIMATIONS_SCRIPT)
+    context.route(TRACKER_URL_PATTERN, lambda route: route.abort())
+
+    # Registered last, so Playwright runs this handler first; requests it
+    # doesn't block fall back to the tracker route instead of going out
+    blocked = frozenset(blocked_resource_types)
+    if blocked:
+        context.route(
+            '**/*', lambda route: route.abort()
+            if route.request.resource_type in blocked else route.fallback())
+
+    return context
+
+
+class BrowserSession:
+    """Browser shared by every broker processed on one thread.
+
+    The browser is launched on first use and each broker gets its own
+    context, so N brokers pay for one browser start instead of N. The browser
+    is relaunched after serving max_uses contexts, or after a context is
+    released as unhealthy. Playwright's sync API is bound to the thread that
+    started it, so a session must only be used and closed on the thread that
+    created it.
+    """
+
+    def __init__(self,
+                 headless: bool = False,
+                 max_uses: int = DEFAULT_MAX_CONTEXT_USES):
+        """Initialize without launching a browser.
+
+        Args:
+            headless: Whether to launch the browser in headless mode
+            max_uses: Contexts to serve before relaunching the browser
+        """
+        self.headless = headless
+        self.max_uses = max_uses
+        self._playwright = None
+        self._browser = None
+        # Contexts released since the current browser was launched
+        self._uses = 0
+        # Context created ahead of time, and the blocked types it was made with
+        self._spare_context = None
+        self._spare_blocked_types = None
+
+    @property
+    def browser(self) -> Browser:
+        """Browser instance, launched on first access."""
+        if self._browser is None:
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(
+                headless=self.headless, args=list(LEAN_BROWSER_ARGS))
+        return self._browser
+
+    def new_context(
+        self, blocked_resource_types: Iterable[str] = ()) -> BrowserContext:
+        """Create an isolated browser context with standard settings.
+
+        Args:
+            blocked_resource_types: Resource types (e.g. 'image') to abort
+
+        Returns:
+            New browser context; the caller is responsible for closing it
+        """
+        blocked_types = tuple(blocked_resource_types)
+        if (self._spare_context is not None
+                and self._spare_blocked_types == blocked_types):
+            context = self._spare_context
+            self._spare_context = None
+            return context
+        return create_browser_context(self.browser, blocked_types)
+
+    def prewarm_context(
+        self, blocked_resource_types: Iterable[str] = ()) -> None:
+        """Create the next broker's context ahead of time.
+
+        Call while this thread would otherwise sit idle, e.g. waiting on an
+        LLM response; the next matching new_context call returns it.
+
+        Args:
+            blocked_resource_types: Resource types the next context will block
+        """
+        if self._spare_context is None:
+            self._spare_blocked_types = tuple(blocked_resource_types)
+            self._spare_context = create_browser_context(
+                self.browser, self._spare_blocked_types)
+
+    def release_context(self,
+                        context: BrowserContext,
+                        healthy: bool = True) -> None:
+        """Close a context from new_context and recycle the browser if due.
+
+        Args:
+            context: Context to close
+            healthy: False if the context hit an unexpected error, which
+                relaunches the browser in case it is in a bad state
+        """
+        try:
+            context.close()
+        except Exception as e:
+            logger.warning(f"Error closing browser context: {str(e)}")
+            healthy = False
+
+        self._uses += 1
+        if not healthy or self._uses >= self.max_uses:
+            self._close_browser()
+
+    def _close_browser(self) -> None:
+        """Close the browser, leaving Playwright running for a relaunch."""
+        browser = self._browser
+        self._browser = None
+        self._spare_context = None
+        self._uses = 0
+        if browser is not None:
+            try:
+                browser.close()
+            except Exception as e:
+                logger.warning(f"Error closing browser: {str(e)}")
+
+    def close(self) -> None:
+        """Close the browser and stop Playwright if they were started."""
+        try:
+            if self._browser is not None:
+                self._browser.close()
+        finally:
+            if self._playwright is not None:
+                self._playwright.stop()
+            self._browser = None
+            self._playwright = None
+            self._spare_context = None
+            self._uses = 0
+
+    def __enter__(self) -> 'BrowserSession':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
 
 def ensure_screenshots_dir() -> Path:
     """Ensure the screenshots directory exists.
@@ -41,29 +258,61 @@ def ensure_screenshots_dir() -> Path:
     return screenshots_dir
 
 
-def take_screenshot(page: Page, name: str) -> Path:
+def take_screenshot(page: Page, name: str) -> Optional[Path]:
     """Take a screenshot and save it to the screenshots directory with timestamp.
 
+    The viewport is captured immediately as a JPEG; the file is written in
+    the background.
+
     Args:
         page: Playwright page instance
         name: Name of the screenshot file (without extension)
 
     Returns:
-        Path to the saved screenshot
+        Path the screenshot is saved to, or None if screenshots are disabled
     """
+    if not _screenshots_enabled:
+        return None
+
     screenshots_dir = ensure_screenshots_dir()
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    screenshot_path = screenshots_dir / f"{name}_{timestamp}.png"
-    page.screenshot(path=str(screenshot_path))
+    screenshot_path = screenshots_dir / f"{name}_{timestamp}.jpg"
+    image = page.screenshot(type='jpeg',
+                            quality=SCREENSHOT_JPEG_QUALITY,
+                            animations='disabled')
+    _screenshot_writer.submit(screenshot_path.write_bytes, image)
     return screenshot_path
 
 
+def navigate_to_form(page: Page,
+                     url: str,
+                     ready_selector: Optional[str] = None,
+                     timeout: int = 30000) -> None:
+    """Navigate to a form and wait until it can be interacted with.
+
+    Waits for DOMContentLoaded plus a form-ready selector instead of network
+    idle, which analytics and ad requests can delay by many seconds.
+
+    Args:
+        page: Playwright page instance
+        url: URL of the form
+        ready_selector: Selector that appears once the form is ready
+        timeout: Timeout in milliseconds for navigation and the selector
+    """
+    page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+    page.wait_for_selector(ready_selector or DEFAULT_READY_SELECTOR,
+                           timeout=timeout)
+
+
 def analyze_form(page: Page) -> Dict:
-    """Analyze the form structure and return field information."""
+    """Analyze the form structure and return field information.
+
+    Fields and the submit button are read in a single evaluate call, so the
+    analysis costs one browser round trip however many fields the form has.
+    """
     try:
-        # Get basic form fields
-        fields = page.evaluate('''() => {
-            return Array.from(document.querySelectorAll('input, select, textarea, [role="combobox"], [role="listbox"]'))
+        analysis = page.evaluate('''() => {
+            const fields = Array.from(document.querySelectorAll('input, select, textarea, [role="combobox"], [role="listbox"]'))
                 .map(field => {
                     // Determine the correct type based on element properties
                     let fieldType = field.type || 'text';
@@ -85,27 +334,29 @@ def analyze_form(page: Page) -> Dict:
                         role: field.getAttribute('role') || ''
                     };
                 });
+
+            // First element matching SUBMIT_BUTTON_SELECTOR, in document order
+            const button = Array.from(document.querySelectorAll('button, input[type="submit"]'))
+                .find(el => el.matches('button[type="submit"], input[type="submit"]')
+                    || (el.tagName === 'BUTTON' && /submit/i.test(el.textContent)));
+            const submitButton = button ? {
+                id: button.id || '',
+                text: (button.innerText || '').trim() || button.getAttribute('value') || ''
+            } : null;
+
+            return {fields, submitButton};
         }''')
 
-        # Get submit button
-        submit_button = page.query_selector(
-            'button[type="submit"], input[type="submit"], button:has-text("Submit")'
-        )
         button_info = None
-        if submit_button:
+        if analysis['submitButton']:
             button_info = {
-                'type':
-                'explicit',
-                'id':
-                submit_button.get_attribute('id') or '',
-                'text':
-                submit_button.inner_text().strip()
-                or submit_button.get_attribute('value') or '',
-                'selector':
-                'button[type="submit"], input[type="submit"], button:has-text("Submit")'
+                'type': 'explicit',
+                'id': analysis['submitButton']['id'],
+                'text': analysis['submitButton']['text'],
+                'selector': SUBMIT_BUTTON_SELECTOR
             }
 
-        return {'fields': fields, 'submit_button': button_info}
+        return {'fields': analysis['fields'], 'submit_button': button_info}
 
     except Exception as e:
         logger.error(f"Error analyzing form: {str(e)}")
@@ -127,8 +378,7 @@ def submit_form(page: Page, submit_info: Optional[Dict] = None) -> None:
             # Try to submit using the provided selector
             submit_button = page.query_selector(submit_info['selector'])
             if submit_button:
-                submit_button.click()
-                page.wait_for_load_state('networkidle')
+                _click_and_wait_for_result(page, submit_button)
                 return
 
         # Fallback strategies if no submit_info or selector didn't work
@@ -144,8 +394,7 @@ def submit_form(page: Page, submit_info: Optional[Dict] = None) -> None:
         for selector in strategies:
             submit_button = page.query_selector(selector)
             if submit_button:
-                submit_button.click()
-                page.wait_for_load_state('networkidle')
+                _click_and_wait_for_result(page, submit_button)
                 return
 
         raise ValueError("Could not find a suitable submit button")
@@ -153,6 +402,29 @@ def submit_form(page: Page, submit_info: Optional[Dict] = None) -> None:
         raise ValueError(f"Error submitting form: {str(e)}")
 
 
+def _click_and_wait_for_result(page: Page, submit_button) -> None:
+    """Click a submit button and wait until the broker acknowledges it.
+
+    Returns as soon as a new confirmation message appears rather than
+    waiting for network idle, which trackers on the result page can hold
+    off. Messages already on the page before the click, such as consent
+    text mentioning requests "received", don't count. Pages without a new
+    recognizable message are given SUBMIT_SETTLE_TIMEOUT.
+
+    Args:
+        page: Playwright page instance
+        submit_button: Submit button element to click
+    """
+    success_messages = page.locator(SUBMIT_SUCCESS_SELECTOR)
+    existing = success_messages.count()
+    submit_button.click()
+    page.wait_for_load_state('load')
+    try:
+        success_messages.nth(existing).wait_for(timeout=SUBMIT_SETTLE_TIMEOUT)
+    except PlaywrightTimeoutError:
+        pass
+
+
 def _find_field_by_id(page: Page, field_id: str) -> Optional[ElementHandle]:
     """Find a form field using common selector strategies.
     
@@ -290,21 +562,19 @@ def select_option(page: Page, field_id: str, target_value: str) -> None:
                 "Field is a listbox, looking for options within the listbox")
 
             # Try to find options within this specific listbox
-            options = page.evaluate(f'''() => {{
-                const listbox = document.querySelector('#{field_id}');
-                if (!listbox) return [];
-                
-                const optionElements = Array.from(listbox.querySelectorAll('[role="option"], div, li, span'));
+            # Evaluate on the located element itself: the script text stays
+            # constant, and listboxes found by name or label work too
+            options = field.evaluate(
+                '''(listbox, selector) => {
+                const optionElements = Array.from(listbox.querySelectorAll(selector));
                 return optionElements
-                    .filter(el => el.offsetParent !== null)  // Only visible elements
-                    .map(el => ({{
+                    .map((el, index) => ({
                         text: el.textContent.trim(),
-                        tag: el.tagName,
-                        role: el.getAttribute('role'),
-                        class: el.className
-                    }}))
-                    .filter(opt => opt.text.length > 0);
-            }}''')
+                        index,
+                        visible: el.offsetParent !== null
+                    }))
+                    .filter(opt => opt.visible && opt.text.length > 0);
+            }''', LISTBOX_OPTION_SELECTOR)
 
             logger.info(
                 f"Found {len(options)} options in listbox: {[opt['text'] for opt in options]}"
@@ -312,10 +582,11 @@ def select_option(page: Page, field_id: str, target_value: str) -> None:
 
             # Find the closest match
             option_texts = [opt['text'] for opt in options]
-            matches = get_close_matches(
-                target_value.lower(), [text.lower() for text in option_texts],
-                n=1,
-                cutoff=0.6)
+            lowered_texts = [text.lower() for text in option_texts]
+            matches = get_close_matches(target_value.lower(),
+                                        lowered_texts,
+                                        n=1,
+                                        cutoff=0.6)
 
             if not matches:
                 raise ValueError(
@@ -327,22 +598,15 @@ def select_option(page: Page, field_id: str, target_value: str) -> None:
                 f"Found closest match: '{best_match}' for target '{target_value}'"
             )
 
-            # Click the matching option within the listbox
-            option_selector = f"#{field_id} [role='option']:has-text('{best_match}'), #{field_id} div:has-text('{best_match}'), #{field_id} li:has-text('{best_match}'), #{field_id} span:has-text('{best_match}')"
-            option = page.query_selector(option_selector)
-
-            if option:
-                option.scroll_into_view_if_needed()
-                option.click()
-                logger.info(
-                    f"Successfully clicked option '{best_match}' within listbox"
-                )
-            else:
-                # Fallback: try clicking by text within the listbox
-                page.click(f"#{field_id} >> text='{best_match}'")
-                logger.info(
-                    f"Successfully clicked option '{best_match}' using fallback method"
-                )
+            # Click the matching option by its position within the located
+            # listbox, so no selector is built from the field ID or its text
+            match = options[lowered_texts.index(best_match)]
+            option_elements = field.query_selector_all(LISTBOX_OPTION_SELECTOR)
+            option = option_elements[match['index']]
+            option.scroll_into_view_if_needed()
+            option.click()
+            logger.info(
+                f"Successfully clicked option '{best_match}' within listbox")
 
         else:
             # For other field types, use the original logic
@@ -382,10 +646,72 @@ def select_option(page: Page, field_id: str, target_value: str) -> None:
             f"Error selecting option in field {field_id}: {str(e)}")
 
 
+def _fill_fields_in_one_call(page: Page, field_mapping: Dict) -> List[str]:
+    """Set plain input, textarea and select values in a single evaluate call.
+
+    Fields are located with the same strategies as _find_field_by_id, and
+    input/change events are dispatched so the page sees a normal edit.
+    Autocomplete fields are only set here when they turn out to be native
+    selects. Fields that cannot be set directly, such as custom widgets or
+    values a date input rejects, are left for fill_form_field.
+
+    Args:
+        page: Playwright page instance
+        field_mapping: Field IDs mapped to their value and type
+
+    Returns:
+        IDs of the fields that were filled
+    """
+    entries = []
+    for field_id, mapping in field_mapping.items():
+        field_type = mapping.get('type', 'text')
+        entries.append([field_id, str(mapping['value']), field_type])
+    return page.evaluate(
+        '''(entries) => {
+        const find = (id) => {
+            const quoted = CSS.escape(id);
+            return document.getElementById(id)
+                || document.querySelector(`[name="${quoted}"]`)
+                || document.querySelector(`[id*="${quoted}"]`)
+                || document.querySelector(`[name*="${quoted}"]`)
+                || document.querySelector(`[aria-label*="${quoted}"]`);
+        };
+        const textTypes = ['text', 'email', 'tel', 'search', 'url', 'number', 'password', 'date'];
+        const filled = [];
+        for (const [id, value, type] of entries) {
+            const el = find(id);
+            if (!el || el.disabled || el.readOnly) continue;
+            // Typing into an autocomplete input needs its dropdown clicked
+            if (type === 'autocomplete' && el.tagName !== 'SELECT') continue;
+            if (el.tagName === 'SELECT') {
+                const option = Array.from(el.options)
+                    .find(o => o.value === value || o.text.trim() === value);
+                if (!option) continue;
+                el.value = option.value;
+            } else if (el.tagName === 'TEXTAREA' || (el.tagName === 'INPUT' && textTypes.includes(el.type))) {
+                // Use the prototype setter so frameworks like React notice the change
+                const proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+                Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+                if (el.value !== value) continue;
+                el.dispatchEvent(new Event('input', {bubbles: true}));
+            } else {
+                continue;
+            }
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+            filled.push(id);
+        }
+        return filled;
+    }''', entries)
+
+
 def fill_form_deterministically(page: Page, field_mapping: Dict,
                                 user_data: Dict) -> Dict:
     """Fill form using AI-discovered field mapping.
-    
+
+    Text, textarea and select fields, and autocomplete fields backed by a
+    native select, are set together in one browser round trip; anything the
+    batch could not set is then filled one at a time.
+
     Args:
         page: Playwright page instance
         field_mapping: Mapping from constrained AI
@@ -396,7 +722,26 @@ def fill_form_deterministically(page: Page, field_mapping: Dict,
     """
     results = {"filled": 0, "failed": 0, "errors": []}
 
+    batch_mapping = {}
     for field_id, mapping in field_mapping.items():
+        if mapping.get('type', 'text') in BATCH_FILL_TYPES:
+            batch_mapping[field_id] = mapping
+
+    batch_filled = set()
+    if batch_mapping:
+        try:
+            batch_filled.update(_fill_fields_in_one_call(page, batch_mapping))
+        except Exception as e:
+            logger.error(f"Batch fill failed, filling fields one by one: {e}")
+
+    for field_id, mapping in field_mapping.items():
+        if field_id in batch_filled:
+            results["filled"] += 1
+            broker_logger.info(
+                f"   ✓ Filled {field_id}: {mapping.get('user_key', 'unknown')}"
+            )
+            continue
+
         try:
             value = mapping['value']
             field_type = mapping.get('type', 'text')
@@ -404,7 +749,7 @@ def fill_form_deterministically(page: Page, field_mapping: Dict,
             success = fill_form_field(page, field_id, value, field_type)
             if success:
                 results["filled"] += 1
-                print(
+                broker_logger.info(
                     f"   ✓ Filled {field_id}: {mapping.get('user_key', 'unknown')}"
                 )
             else:
@@ -415,7 +760,7 @@ def fill_form_deterministically(page: Page, field_mapping: Dict,
             results["failed"] += 1
             error_msg = f"Error filling {field_id}: {str(e)}"
             results["errors"].append(error_msg)
-            print(f"   ❌ {error_msg}")
+            broker_logger.info(f"   ❌ {error_msg}")
 
     return results
 
@@ -453,13 +798,3 @@ def fill_form_field(page: Page,
     except Exception as e:
         logger.error(f"Error filling field {field_id}: {str(e)}")
         return False
-
-
-def wait_for_navigation(page: Page, timeout: Optional[int] = None) -> None:
-    """Wait for page navigation to complete.
-    
-    Args:
-        page: Playwright page instance
-        timeout: Optional timeout in milliseconds
-    """
-    page.wait_for_load_state('networkidle', timeout=timeout)
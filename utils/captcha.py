@@ -1,11 +1,68 @@
 """CAPTCHA solving utilities for data deletion automation."""
 import os
+import time
 from typing import Optional
 from anticaptchaofficial.recaptchav2proxyless import recaptchaV2Proxyless
+from .broker_log import get_broker_logger
+
+logger = get_broker_logger()
 
 # Reference: https://github.com/anti-captcha/anticaptcha-python/tree/master/anticaptchaofficial
 # How to get the website key: https://anti-captcha.com/apidoc/articles/how-to-find-the-sitekey
 
+# Seconds between checks for a solved task; solves take anywhere from a few
+# seconds to minutes, so checks start often and back off to the maximum
+CAPTCHA_POLL_INITIAL_DELAY = 1
+CAPTCHA_POLL_MAX_DELAY = 5
+CAPTCHA_POLL_BACKOFF = 1.5
+
+# Seconds to wait for a task to be solved before giving up
+CAPTCHA_SOLVE_TIMEOUT = 300
+
+
+class _BackoffRecaptchaSolver(recaptchaV2Proxyless):
+    """reCAPTCHA solver that polls for its result with a growing delay.
+
+    The library checks once a second until the task is solved, which spends
+    dozens of API calls on a slow solve, and its timeout counts checks rather
+    than seconds.
+    """
+
+    def wait_for_result(self,
+                        max_seconds=CAPTCHA_SOLVE_TIMEOUT,
+                        current_second=0):
+        """Poll for the created task's result.
+
+        Args:
+            max_seconds: Seconds to wait for the solution
+            current_second: Seconds already waited
+
+        Returns:
+            The solved task response, or 0 if solving failed or timed out
+        """
+        deadline = time.monotonic() + max_seconds - current_second
+        delay = CAPTCHA_POLL_INITIAL_DELAY
+        while time.monotonic() < deadline:
+            task_check = self.make_request("getTaskResult", {
+                "clientKey": self.client_key,
+                "taskId": self.task_id
+            })
+            if task_check == 0:
+                return 0
+            if task_check["errorId"] != 0:
+                self.error_code = task_check["errorCode"]
+                self.err_string = f"API error {task_check['errorCode']}: {task_check['errorDescription']}"
+                self.log(self.err_string)
+                return 0
+            if task_check["status"] == "ready":
+                self.log("task solved")
+                return task_check
+            time.sleep(delay)
+            delay = min(delay * CAPTCHA_POLL_BACKOFF, CAPTCHA_POLL_MAX_DELAY)
+
+        self.err_string = "task solution expired"
+        return 0
+
 
 def get_api_key() -> str:
     key = os.getenv("ANTICAPTCHA_API_KEY")
@@ -28,10 +85,10 @@ def solve_captcha(website_url: str = None,
     if not website_url or not website_key:
         raise ValueError("Both website_url and website_key are required")
 
-    print("Setting up CAPTCHA solver...")
+    logger.info("Setting up CAPTCHA solver...")
 
     try:
-        solver = recaptchaV2Proxyless()
+        solver = _BackoffRecaptchaSolver()
         solver.set_verbose(1)
         solver.set_key(get_api_key())
         solver.set_website_url(website_url)
@@ -39,17 +96,18 @@ def solve_captcha(website_url: str = None,
         # Optional: set custom parameter for Google Search results protection
         # solver.set_data_s('"data-s" token from Google Search results "protection"')
 
-        print(f"Starting CAPTCHA solving for: {website_url}")
+        logger.info(f"Starting CAPTCHA solving for: {website_url}")
 
         g_response = solver.solve_and_return_solution()
 
         if g_response != 0:
-            print(f"✓ CAPTCHA solved successfully (length: {len(g_response)})")
+            logger.info(
+                f"✓ CAPTCHA solved successfully (length: {len(g_response)})")
         else:
-            print(f"❌ CAPTCHA solving failed: {solver.error_code}")
+            logger.info(f"❌ CAPTCHA solving failed: {solver.error_code}")
 
         return g_response
 
     except Exception as e:
-        print(f"❌ CAPTCHA solving exception: {str(e)}")
+        logger.info(f"❌ CAPTCHA solving exception: {str(e)}")
         return None
@@ -1,9 +1,56 @@
 """Constrained AI utilities for broker form automation with guardrails."""
+import hashlib
 import json
 import os
+import re
+import threading
 from datetime import datetime
-from typing import Dict, Optional
-from langchain_openai import ChatOpenAI
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .broker_log import get_broker_logger
+
+logger = get_broker_logger()
+
+# Configs generated from successful AI mappings, kept apart from
+# broker_configs/*.json so they never replace or duplicate a hand-written
+# config; the AI fallback reuses their field mappings on later runs
+DISCOVERED_CONFIG_DIRECTORY = (Path(__file__).parent.parent /
+                               'broker_configs' / 'discovered')
+
+# Input types the mapper never fills, left out of the prompt to save tokens
+UNFILLABLE_FIELD_TYPES = frozenset({
+    'hidden', 'submit', 'button', 'reset', 'image', 'checkbox', 'radio', 'file'
+})
+
+# Field attributes the LLM needs to map a field; required, value and role
+# don't help and would only add tokens
+PROMPT_FIELD_KEYS = ('id', 'name', 'type', 'label')
+
+# Patterns matched against a field's id, name and label split into words,
+# mapping obvious fields without the LLM. The first match wins, so email
+# comes before address ("Email Address") and line 2 of an address is skipped
+FIELD_RULES = (
+    (re.compile(r'\be ?mail\b'), 'email'),
+    (re.compile(r'\b(first|given) ?name\b|\bfname\b'), 'first_name'),
+    (re.compile(r'\b(last|family|sur) ?name\b|\blname\b'), 'last_name'),
+    (re.compile(r'\bbirth|\bdob\b'), 'date_of_birth'),
+    (re.compile(r'\bzip|\bpostal\b'), 'zip_code'),
+    (re.compile(r'\bcity\b|\btown\b'), 'city'),
+    (re.compile(r'\bstate\b|\bprovince\b'), 'state'),
+    (re.compile(r'\bstreet\b|\baddress\b(?! ?(line )?2)'), 'address'),
+)
+
+# Field types from analyze_form() that FIELD_RULES may map, and the mapping
+# type each is filled as
+RULE_FIELD_TYPES = {
+    'text': 'text',
+    'email': 'text',
+    'tel': 'text',
+    'search': 'text',
+    'textarea': 'textarea',
+    'option': 'autocomplete',
+    'autocomplete': 'autocomplete'
+}
 
 
 class ConstrainedFormMapper:
@@ -14,17 +61,38 @@ class ConstrainedFormMapper:
         if not os.getenv("OPENAI_API_KEY"):
             raise ValueError("OPENAI_API_KEY required for AI fallback")
 
-        self.llm = ChatOpenAI(temperature=temperature, model=model)
+        # Imported here because langchain takes most of a second to import,
+        # which the CLI's --help and argument errors shouldn't pay for
+        from langchain_openai import ChatOpenAI
+        llm = ChatOpenAI(temperature=temperature, model=model)
+        # JSON mode guarantees a parseable reply, so attempts are only spent
+        # on mappings that fail validation
+        self.llm = llm.bind(response_format={'type': 'json_object'})
         self.max_attempts = 3
-
-    def map_form_fields(self, form_analysis: Dict, user_data: Dict,
-                        broker_name: str) -> Dict:
+        # Mappings keyed by form fingerprint, so brokers that share a form
+        # (e.g. one hosted privacy portal) need a single LLM call
+        self._mapping_cache: Dict[str, Dict] = {}
+        self._mapping_cache_lock = threading.Lock()
+
+    def map_form_fields(
+            self,
+            form_analysis: Dict,
+            user_data: Dict,
+            broker_name: str,
+            saved_mappings: Optional[Dict[str, str]] = None) -> Dict:
         """Map form fields to user data with strict validation.
+
+        Saved mappings are used as-is when every field in them is still on
+        the form. Otherwise fields FIELD_RULES recognize are mapped locally,
+        and only the rest are sent to the LLM, which is skipped when nothing
+        is left.
         
         Args:
             form_analysis: Form structure from analyze_form()
             user_data: Available user data
             broker_name: Name of the broker for context
+            saved_mappings: Field ID to user data key from an earlier run,
+                e.g. from load_discovered_mappings()
             
         Returns:
             Validated field mapping dictionary
@@ -32,33 +100,176 @@ class ConstrainedFormMapper:
         Raises:
             ValueError: If mapping fails validation after max attempts
         """
-        print(f"🤖 AI Fallback: Analyzing {broker_name} form (no config found)")
+        logger.info(
+            f"🤖 AI Fallback: Analyzing {broker_name} form (no config found)")
+
+        fingerprint = self._form_fingerprint(form_analysis, user_data)
+        with self._mapping_cache_lock:
+            cached = self._mapping_cache.get(fingerprint)
+        if cached is not None:
+            mapping = self._validate_mapping(cached, form_analysis, user_data)
+            if mapping:
+                logger.info(f"   ✓ Reused mapping of an identical form "
+                            f"({len(mapping)} fields)")
+                return mapping
+
+        if saved_mappings:
+            mapping = self._apply_saved_mappings(saved_mappings, form_analysis,
+                                                 user_data)
+            if mapping:
+                logger.info(
+                    f"   ✓ Reused saved mapping ({len(mapping)} fields)")
+                self._cache_mapping(fingerprint, mapping)
+                return mapping
+            logger.info("   ⚠ Saved mapping no longer matches the form")
+
+        # Map obvious fields locally; only the rest need the LLM
+        rule_mapping, unresolved = self._apply_field_rules(
+            form_analysis.get('fields', []), user_data)
+        rule_mapping = self._validate_mapping(rule_mapping, form_analysis,
+                                              user_data) or {}
+        if rule_mapping:
+            logger.info(f"   ✓ Matched {len(rule_mapping)} fields by name")
+        if not unresolved and rule_mapping:
+            self._cache_mapping(fingerprint, rule_mapping)
+            return rule_mapping
 
         # Sanitize user data for prompt (remove actual values)
         sanitized_data = {k: f"<{k.upper()}>" for k in user_data.keys()}
 
-        prompt = self._create_mapping_prompt(form_analysis, sanitized_data,
-                                             broker_name)
+        prompt = self._create_mapping_prompt({'fields': unresolved},
+                                             sanitized_data, broker_name)
 
         for attempt in range(self.max_attempts):
             try:
-                print(f"   Attempt {attempt + 1}/{self.max_attempts}")
+                logger.info(f"   Attempt {attempt + 1}/{self.max_attempts}")
 
                 response = self.llm.invoke(prompt)
                 mapping = self._parse_and_validate_mapping(
                     response.content, form_analysis, user_data)
 
-                if mapping:
-                    print(f"   ✓ Successfully mapped {len(mapping)} fields")
+                # With fields already matched, an empty answer just means
+                # nothing else needs filling
+                if mapping or rule_mapping:
+                    mapping = {**(mapping or {}), **rule_mapping}
+                    logger.info(
+                        f"   ✓ Successfully mapped {len(mapping)} fields")
+                    self._cache_mapping(fingerprint, mapping)
                     return mapping
 
             except Exception as e:
-                print(f"   ⚠ Attempt {attempt + 1} failed: {str(e)}")
+                logger.info(f"   ⚠ Attempt {attempt + 1} failed: {str(e)}")
 
+        if rule_mapping:
+            return rule_mapping
         raise ValueError(
             f"Failed to generate valid field mapping for {broker_name} after {self.max_attempts} attempts"
         )
 
+    def _apply_saved_mappings(self, saved_mappings: Dict[str, str],
+                              form_analysis: Dict,
+                              user_data: Dict) -> Optional[Dict]:
+        """Validate saved mappings against the current form.
+
+        Args:
+            saved_mappings: Field ID to user data key
+            form_analysis: Form structure from analyze_form()
+            user_data: Available user data
+
+        Returns:
+            Validated field mapping, or None if any saved field is missing,
+            can't be filled or maps to unavailable user data
+        """
+        field_types = {}
+        for field in form_analysis.get('fields', []):
+            field_types[field.get('id', '')] = field.get('type')
+
+        raw_mapping = {}
+        for field_id, user_key in saved_mappings.items():
+            if field_id not in field_types:
+                return None
+            input_type = field_types[field_id]
+            if input_type in UNFILLABLE_FIELD_TYPES:
+                return None
+            # Inputs such as date or number are filled like text fields
+            field_type = RULE_FIELD_TYPES.get(input_type, 'text')
+            raw_mapping[field_id] = {
+                'user_data_key': user_key,
+                'field_type': field_type
+            }
+
+        mapping = self._validate_mapping(raw_mapping, form_analysis, user_data)
+        if not mapping or len(mapping) != len(raw_mapping):
+            return None
+        return mapping
+
+    def _apply_field_rules(self, fields: List[Dict],
+                           user_data: Dict) -> Tuple[Dict, List[Dict]]:
+        """Map fields whose id, name or label clearly names a user data key.
+
+        Args:
+            fields: Fields from analyze_form()
+            user_data: Available user data
+
+        Returns:
+            Raw mapping in the LLM's response format, and the fillable fields
+            no rule matched
+        """
+        mapping = {}
+        unresolved = []
+        for field in fields:
+            if field.get('type') in UNFILLABLE_FIELD_TYPES:
+                continue
+            field_type = RULE_FIELD_TYPES.get(field.get('type'))
+            user_key = self._match_field_rule(field) if field_type else None
+            if field.get('id') and user_key in user_data:
+                mapping[field['id']] = {
+                    'user_data_key': user_key,
+                    'field_type': field_type
+                }
+            else:
+                unresolved.append(field)
+        return mapping, unresolved
+
+    def _match_field_rule(self, field: Dict) -> Optional[str]:
+        """Get the user data key the first matching FIELD_RULES entry names."""
+        text = ' '.join(
+            field.get(key) or '' for key in ('id', 'name', 'label'))
+        # Split camelCase and punctuation into words, e.g. firstName
+        text = re.sub(r'([a-z0-9])([A-Z])', r'\1 \2', text)
+        text = re.sub(r'[^a-z0-9]+', ' ', text.lower())
+        for pattern, user_key in FIELD_RULES:
+            if pattern.search(text):
+                return user_key
+        return None
+
+    def _form_fingerprint(self, form_analysis: Dict, user_data: Dict) -> str:
+        """Identify a form by its fillable fields and the user data offered.
+
+        Args:
+            form_analysis: Form structure from analyze_form()
+            user_data: Available user data
+
+        Returns:
+            Hex digest equal for forms the LLM would see identically
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            self._format_fields(form_analysis.get('fields', [])).encode())
+        digest.update(json.dumps(sorted(user_data)).encode())
+        return digest.hexdigest()
+
+    def _cache_mapping(self, fingerprint: str, mapping: Dict) -> None:
+        """Remember a validated mapping without its user data values."""
+        raw_mapping = {}
+        for field_id, field_mapping in mapping.items():
+            raw_mapping[field_id] = {
+                'user_data_key': field_mapping['user_key'],
+                'field_type': field_mapping['type']
+            }
+        with self._mapping_cache_lock:
+            self._mapping_cache[fingerprint] = raw_mapping
+
     def _create_mapping_prompt(self, form_analysis: Dict, sanitized_data: Dict,
                                broker_name: str) -> str:
         """Create a constrained prompt for field mapping."""
@@ -71,11 +282,11 @@ STRICT RULES:
 4. Map to user data keys that exist
 5. Include field type (text/select/autocomplete)
 
-Form Fields Available:
-{json.dumps(form_analysis.get('fields', []), indent=2)}
+Form Fields Available (one per line):
+{self._format_fields(form_analysis.get('fields', []))}
 
 User Data Available:
-{json.dumps(list(sanitized_data.keys()), indent=2)}
+{json.dumps(list(sanitized_data.keys()))}
 
 Return ONLY this JSON format:
 {{
@@ -90,25 +301,36 @@ Requirements:
 - Only include confident mappings
 - Return empty object {{}} if no clear mappings found"""
 
+    def _format_fields(self, fields: List[Dict]) -> str:
+        """Describe form fields compactly for the prompt.
+
+        Each fillable field becomes one line of compact JSON holding only
+        its non-empty PROMPT_FIELD_KEYS, which takes far fewer tokens than
+        indented JSON. The name is left out when it just repeats the id.
+
+        Args:
+            fields: Fields from analyze_form()
+
+        Returns:
+            One JSON object per line
+        """
+        lines = []
+        for field in fields:
+            if field.get('type') in UNFILLABLE_FIELD_TYPES:
+                continue
+            present = {}
+            for key in PROMPT_FIELD_KEYS:
+                if field.get(key):
+                    present[key] = field[key]
+            if present.get('name') == present.get('id'):
+                present.pop('name', None)
+            lines.append(json.dumps(present, separators=(',', ':')))
+        return '\n'.join(lines)
+
     def _parse_and_validate_mapping(self, response: str, form_analysis: Dict,
                                     user_data: Dict) -> Optional[Dict]:
         """Parse and validate the AI response."""
         try:
-            # Extract JSON from response
-            response = response.strip()
-            if response.startswith('```'):
-                # Remove markdown code blocks
-                lines = response.split('\n')
-                json_lines = []
-                in_json = False
-                for line in lines:
-                    if line.startswith('```'):
-                        in_json = not in_json
-                        continue
-                    if in_json:
-                        json_lines.append(line)
-                response = '\n'.join(json_lines)
-
             mapping_raw = json.loads(response)
 
             # Validate the mapping
@@ -116,10 +338,10 @@ Requirements:
                                           user_data)
 
         except json.JSONDecodeError as e:
-            print(f"   ❌ Invalid JSON response: {e}")
+            logger.info(f"   ❌ Invalid JSON response: {e}")
             return None
         except Exception as e:
-            print(f"   ❌ Validation error: {e}")
+            logger.info(f"   ❌ Validation error: {e}")
             return None
 
     def _validate_mapping(self, mapping: Dict, form_analysis: Dict,
@@ -146,19 +368,19 @@ Requirements:
 
             # Validate field exists in form
             if field_id not in form_fields:
-                print(f"   ⚠ Field '{field_id}' not found in form")
+                logger.info(f"   ⚠ Field '{field_id}' not found in form")
                 continue
 
             # Validate user data key exists
             if user_key not in user_data:
-                print(f"   ⚠ User data key '{user_key}' not available")
+                logger.info(f"   ⚠ User data key '{user_key}' not available")
                 continue
 
             # Validate field type
             if field_type not in [
                     'text', 'select', 'autocomplete', 'textarea'
             ]:
-                print(f"   ⚠ Invalid field type '{field_type}'")
+                logger.info(f"   ⚠ Invalid field type '{field_type}'")
                 continue
 
             # Add to validated mapping with actual user data value
@@ -223,8 +445,37 @@ def generate_broker_config(broker_name: str, form_analysis: Dict,
     return config
 
 
+def _discovered_config_path(broker_name: str) -> Path:
+    """Get the path of a broker's generated config."""
+    return DISCOVERED_CONFIG_DIRECTORY / f'{broker_name.lower()}.json'
+
+
+def load_discovered_mappings(broker_name: str) -> Optional[Dict[str, str]]:
+    """Load the field mappings saved by save_discovered_config.
+
+    Args:
+        broker_name: Name of the broker
+
+    Returns:
+        Field ID to user data key, or None if no usable config was saved
+    """
+    try:
+        with open(_discovered_config_path(broker_name)) as f:
+            config = json.load(f)
+        mappings = config['form_config']['field_mappings']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    if not isinstance(mappings, dict):
+        return None
+    return mappings or None
+
+
 def save_discovered_config(broker_name: str, config: Dict) -> str:
     """Save auto-generated config for future use.
+
+    Configs go to DISCOVERED_CONFIG_DIRECTORY rather than broker_configs/
+    itself, so a hand-written config is never overwritten.
     
     Args:
         broker_name: Name of the broker
@@ -233,18 +484,13 @@ def save_discovered_config(broker_name: str, config: Dict) -> str:
     Returns:
         Path where config was saved
     """
-    from pathlib import Path
-
-    # Save to broker_configs directory
-    config_dir = Path(__file__).parent.parent / 'broker_configs'
-    config_dir.mkdir(exist_ok=True)
-
-    config_path = config_dir / f'{broker_name.lower()}.json'
+    config_path = _discovered_config_path(broker_name)
+    config_path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(config_path, 'w') as f:
         json.dump(config, f, indent=2)
 
-    print(f"💾 Generated config saved: {config_path}")
-    print(f"   Review and adjust the config as needed for {broker_name}")
+    logger.info(f"💾 Generated config saved: {config_path}")
+    logger.info(f"   Review and adjust the config as needed for {broker_name}")
 
     return str(config_path)
@@ -1,15 +1,19 @@
 """Gmail API utility functions for data deletion automation."""
 import os
 import pickle
+from functools import lru_cache
 from typing import Optional, List, Dict
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import base64
 import time
+from datetime import datetime, timedelta, timezone
+from .broker_log import get_broker_logger
+
+logger = get_broker_logger()
 
 # Gmail API scopes
 SCOPES = [
@@ -18,11 +22,54 @@ SCOPES = [
     'https://www.googleapis.com/auth/gmail.modify'
 ]
 
+# Deletion request email, filled in with str.format_map for each broker
+DELETION_EMAIL_SUBJECT = '[Data Deletion Request] {broker_name} - {first_name} {last_name}'
+DELETION_EMAIL_BODY = """Dear {broker_name} Data Privacy Team,
+
+I am writing to request the deletion of my personal information from your database under my rights under various privacy laws including CCPA, GDPR, and other applicable data protection regulations.
+
+My information that may be in your database:
+- First Name: {first_name}
+- Last Name: {last_name}
+- Email: {user_email}
+
+Please confirm receipt of this request and provide information about the status of my data deletion request.
+
+Thank you for your attention to this matter.
+
+Best regards,
+{first_name} {last_name}"""
+
+# Gmail OAuth token store, and the pickle store it replaces
+TOKEN_PATH = 'token.json'
+LEGACY_TOKEN_PATH = 'token.pickle'
+
+# Stored tokens this close to expiry are refreshed before the run starts, so
+# a long run doesn't stall on a refresh partway through
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Gmail rejects batch requests with more than 100 inner requests
+GMAIL_BATCH_LIMIT = 100
+
+# Subject keywords that identify a confirmation/response email
+CONFIRMATION_KEYWORDS = [
+    'confirmation',
+    'privacy request',
+    'request needs attention',
+    'request id',
+    'privacy portal',
+    'request received',
+    'submission received'
+]
+
 def get_gmail_service(creds: Optional[Credentials] = None) -> build:
     """Get Gmail API service instance.
 
+    The service built from token.json is created once and reused, so
+    repeated calls don't redo the credential refresh round trip.
+
     Args:
-        creds: Optional credentials object. If not provided, will try to load from token.pickle.
+        creds: Optional credentials object. If not provided, will try to load from token.json.
 
     Returns:
         Gmail API service instance.
@@ -31,22 +78,66 @@ def get_gmail_service(creds: Optional[Credentials] = None) -> build:
         FileNotFoundError: If credentials.json is not found.
     """
     if creds is None:
-        if os.path.exists('token.pickle'):
-            with open('token.pickle', 'rb') as token:
-                creds = pickle.load(token)
-
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                if not os.path.exists('credentials.json'):
-                    raise FileNotFoundError("credentials.json not found. See README.md for instructions.")
-                flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
-                creds = flow.run_local_server(port=0)
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(creds, token)
-
-    return build('gmail', 'v1', credentials=creds)
+        return _get_default_gmail_service()
+    return _build_gmail(creds)
+
+
+@lru_cache(maxsize=1)
+def _get_default_gmail_service() -> build:
+    """Build the Gmail service from stored credentials, refreshing them if needed."""
+    creds = _load_token()
+
+    # Only tokens that can be refreshed are renewed ahead of expiry; others
+    # stay in use until they actually expire
+    if not creds or not creds.valid or (creds.refresh_token and _expires_soon(creds)):
+        if creds and creds.refresh_token:
+            creds.refresh(Request())
+        else:
+            if not os.path.exists('credentials.json'):
+                raise FileNotFoundError("credentials.json not found. See README.md for instructions.")
+            # Only needed for first-time authorization, so imported on demand
+            from google_auth_oauthlib.flow import InstalledAppFlow
+            flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
+            creds = flow.run_local_server(port=0)
+        _save_token(creds)
+
+    return _build_gmail(creds)
+
+def _build_gmail(creds: Credentials) -> build:
+    """Build the Gmail service from the discovery document bundled with the client library.
+
+    This never fetches the discovery document over the network, and it skips the
+    discovery cache, which only applies to fetched documents.
+    """
+    return build('gmail', 'v1', credentials=creds, static_discovery=True, cache_discovery=False)
+
+def _expires_soon(creds: Credentials) -> bool:
+    """Check whether credentials expire within TOKEN_REFRESH_MARGIN."""
+    # google-auth stores expiry as a naive UTC datetime
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return creds.expiry is not None and creds.expiry - now < TOKEN_REFRESH_MARGIN
+
+def _load_token() -> Optional[Credentials]:
+    """Load stored credentials, migrating a token.pickle from older versions to token.json."""
+    if os.path.exists(TOKEN_PATH):
+        return Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
+
+    if os.path.exists(LEGACY_TOKEN_PATH):
+        # Written by this tool itself, so unpickling it once is safe
+        with open(LEGACY_TOKEN_PATH, 'rb') as token:
+            creds = pickle.load(token)
+        _save_token(creds)
+        return creds
+
+    return None
+
+def _save_token(creds: Credentials) -> None:
+    """Write credentials to token.json atomically, so readers never see a partial file."""
+    tmp_path = f'{TOKEN_PATH}.tmp'
+    with open(tmp_path, 'w') as token:
+        token.write(creds.to_json())
+    os.replace(tmp_path, TOKEN_PATH)
+
 
 def ensure_label_exists(service: build, label_name: str) -> str:
     """Ensure the label exists and return its ID.
@@ -85,26 +176,15 @@ def create_deletion_email(first_name: str, last_name: str, user_email: str, brok
     Returns:
         MIME multipart message object
     """
+    fields = {
+        'broker_name': broker_name,
+        'first_name': first_name,
+        'last_name': last_name,
+        'user_email': user_email
+    }
     msg = MIMEMultipart()
-    msg['Subject'] = f'[Data Deletion Request] {broker_name} - {first_name} {last_name}'
-
-    body = f"""Dear {broker_name} Data Privacy Team,
-
-I am writing to request the deletion of my personal information from your database under my rights under various privacy laws including CCPA, GDPR, and other applicable data protection regulations.
-
-My information that may be in your database:
-- First Name: {first_name}
-- Last Name: {last_name}
-- Email: {user_email}
-
-Please confirm receipt of this request and provide information about the status of my data deletion request.
-
-Thank you for your attention to this matter.
-
-Best regards,
-{first_name} {last_name}"""
-
-    msg.attach(MIMEText(body, 'plain'))
+    msg['Subject'] = DELETION_EMAIL_SUBJECT.format_map(fields)
+    msg.attach(MIMEText(DELETION_EMAIL_BODY.format_map(fields), 'plain'))
     return msg
 
 def send_email(service: build, msg: MIMEMultipart, label_id: Optional[str] = None) -> Dict:
@@ -154,12 +234,12 @@ def check_confirmation_email(
     Returns:
         True if confirmation email found, False otherwise
     """
-    print(f"\nWaiting for confirmation email (up to {wait_time} seconds)...")
-    print(f"Searching domains: {from_domains}")
+    logger.info(f"\nWaiting for confirmation email (up to {wait_time} seconds)...")
+    logger.debug(f"Searching domains: {from_domains}")
     
     from_query = ' OR '.join(f'from:{domain}' for domain in from_domains)
     query = f'({from_query}) to:{user_email} newer_than:1d'
-    print(f"Gmail search query: {query}")
+    logger.debug(f"Gmail search query: {query}")
 
     start_time = time.time()
     check_count = 0
@@ -169,16 +249,16 @@ def check_confirmation_email(
         messages = results.get('messages', [])
         
         if check_count == 1:  # First check - show what emails we found
-            print(f"Found {len(messages)} emails from specified domains")
+            logger.debug(f"Found {len(messages)} emails from specified domains")
             if messages:
-                print("Recent emails from these domains:")
+                logger.debug("Recent emails from these domains:")
                 for i, message in enumerate(messages[:3]):  # Show first 3
                     msg = service.users().messages().get(userId='me', id=message['id']).execute()
                     headers = msg['payload']['headers']
                     subject = next((h['value'] for h in headers if h['name'].lower() == 'subject'), 'No subject')
                     from_header = next((h['value'] for h in headers if h['name'].lower() == 'from'), 'Unknown sender')
-                    print(f"  {i+1}. From: {from_header}")
-                    print(f"     Subject: {subject}")
+                    logger.debug(f"  {i+1}. From: {from_header}")
+                    logger.debug(f"     Subject: {subject}")
 
         for message in messages:
             msg = service.users().messages().get(userId='me', id=message['id']).execute()
@@ -191,27 +271,119 @@ def check_confirmation_email(
                 if email_timestamp <= after_time:
                     continue  # Skip emails received before/at submission time
 
-            # Check for various confirmation/response keywords
-            confirmation_keywords = [
-                'confirmation',
-                'privacy request', 
-                'request needs attention',
-                'request id',
-                'privacy portal',
-                'request received',
-                'submission received'
-            ]
-            
-            if any(keyword in subject.lower() for keyword in confirmation_keywords):
+            if any(keyword in subject.lower() for keyword in CONFIRMATION_KEYWORDS):
                 from_header = next((h['value'] for h in headers if h['name'].lower() == 'from'), 'Unknown sender')
-                print(f"\n✓ Found confirmation email: {subject}")
-                print(f"  From: {from_header}")
+                logger.info(f"\n✓ Found confirmation email: {subject}")
+                logger.info(f"  From: {from_header}")
                 if after_time:
-                    print(f"  Received: {(email_timestamp - after_time):.1f} seconds after submission")
+                    logger.info(f"  Received: {(email_timestamp - after_time):.1f} seconds after submission")
                 return True
 
         time.sleep(check_interval)
-        print(".", end="", flush=True)
+        logger.debug("Still waiting for a confirmation email...")
 
-    print("\n✗ No confirmation email received within the time limit")
+    logger.info("\n✗ No confirmation email received within the time limit")
     return False
+
+def _get_header(msg: Dict, name: str, default: str = '') -> str:
+    """Return a header value from a Gmail message resource."""
+    headers = msg.get('payload', {}).get('headers', [])
+    return next((h['value'] for h in headers if h['name'].lower() == name), default)
+
+def _batch_get_messages(service: build, message_ids: List[str]) -> Dict[str, Dict]:
+    """Fetch message metadata using Gmail batch requests.
+
+    Args:
+        service: Gmail API service instance
+        message_ids: IDs of the messages to fetch
+
+    Returns:
+        Dictionary mapping message ID to message resource
+    """
+    messages = {}
+
+    def on_message(request_id, response, exception):
+        if exception is None:
+            messages[request_id] = response
+
+    for start in range(0, len(message_ids), GMAIL_BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=on_message)
+        for message_id in message_ids[start:start + GMAIL_BATCH_LIMIT]:
+            batch.add(service.users().messages().get(
+                userId='me',
+                id=message_id,
+                format='metadata',
+                metadataHeaders=['Subject', 'From']
+            ), request_id=message_id)
+        batch.execute()
+
+    return messages
+
+def check_confirmation_emails(
+    service: build,
+    user_email: str,
+    broker_domains: Dict[str, List[str]],
+    submission_times: Dict[str, float],
+    wait_time: int = 300,
+    check_interval: int = 10
+) -> Dict[str, bool]:
+    """Check for confirmation emails for several brokers with shared Gmail calls.
+
+    Each poll issues a single messages.list query covering every pending broker's
+    domains and fetches new messages through batch requests, instead of one
+    list plus one get per message for every broker.
+
+    Args:
+        service: Gmail API service instance
+        user_email: User's email address
+        broker_domains: Mapping of broker name to domains to check for emails from
+        submission_times: Mapping of broker name to Unix submission timestamp
+        wait_time: Maximum time to wait in seconds
+        check_interval: Time between checks in seconds
+
+    Returns:
+        Dictionary mapping broker name to whether a confirmation email was found
+    """
+    confirmed = {broker: False for broker in broker_domains}
+    pending = {broker: [d.lower() for d in domains] for broker, domains in broker_domains.items() if domains}
+    if not pending:
+        return confirmed
+
+    all_domains = sorted({domain for domains in pending.values() for domain in domains})
+    from_query = ' OR '.join(f'from:{domain}' for domain in all_domains)
+    earliest = int(min(submission_times[broker] for broker in pending))
+    query = f'({from_query}) to:{user_email} after:{earliest}'
+
+    logger.info(f"\nWaiting for confirmation emails from {len(pending)} broker(s) (up to {wait_time} seconds)...")
+    logger.debug(f"Gmail search query: {query}")
+
+    seen = {}
+    start_time = time.time()
+    while pending and time.time() - start_time < wait_time:
+        results = service.users().messages().list(userId='me', q=query).execute()
+        new_ids = [m['id'] for m in results.get('messages', []) if m['id'] not in seen]
+        seen.update(_batch_get_messages(service, new_ids))
+
+        for msg in seen.values():
+            subject = _get_header(msg, 'subject', 'No subject')
+            if not any(keyword in subject.lower() for keyword in CONFIRMATION_KEYWORDS):
+                continue
+
+            from_header = _get_header(msg, 'from', 'Unknown sender')
+            email_timestamp = int(msg['internalDate']) / 1000
+            for broker, domains in list(pending.items()):
+                if email_timestamp <= submission_times[broker]:
+                    continue
+                if any(domain in from_header.lower() for domain in domains):
+                    logger.info(f"\n✓ Found confirmation email for {broker}: {subject}")
+                    logger.info(f"  From: {from_header}")
+                    confirmed[broker] = True
+                    del pending[broker]
+
+        if pending:
+            time.sleep(check_interval)
+            logger.debug("Still waiting for confirmation emails...")
+
+    if pending:
+        logger.info(f"\n✗ No confirmation email received within the time limit for: {', '.join(pending)}")
+    return confirmed
@@ -1,8 +1,9 @@
 """State validation and formatting utilities."""
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping
 
 # State code to full name mapping
-STATE_MAPPING: Dict[str, str] = {
+_STATE_NAMES: Dict[str, str] = {
     'AL': 'Alabama',
     'AK': 'Alaska',
     'AZ': 'Arizona',
@@ -56,8 +57,31 @@ STATE_MAPPING: Dict[str, str] = {
     'DC': 'District of Columbia'
 }
 
+# The public tables are read-only views: the lookup below is derived from
+# them once at import, so changing them afterwards would go unnoticed
+STATE_MAPPING: Mapping[str, str] = MappingProxyType(_STATE_NAMES)
+
 # Reverse mapping for full name to code
-NAME_TO_CODE: Dict[str, str] = {v: k for k, v in STATE_MAPPING.items()}
+NAME_TO_CODE: Mapping[str, str] = MappingProxyType({
+    v: k
+    for k, v in STATE_MAPPING.items()
+})
+
+# Common spellings that are neither a code nor the canonical name
+STATE_VARIATIONS: Mapping[str, str] = MappingProxyType({
+    'Washington DC': 'DC',
+    'Washington D.C.': 'DC',
+    'D.C.': 'DC'
+})
+
+# Lowercased code, full name or variation to code, built once at import
+_STATE_LOOKUP: Dict[str, str] = {code.lower(): code for code in STATE_MAPPING}
+for _names in (NAME_TO_CODE, STATE_VARIATIONS):
+    _STATE_LOOKUP.update({name.lower(): code for name, code in _names.items()})
+
+_VALID_STATES_MESSAGE = (
+    f"- 2-letter code: {', '.join(sorted(STATE_MAPPING.keys()))}\n"
+    f"- Full name: {', '.join(sorted(STATE_MAPPING.values()))}")
 
 
 def validate_state_input(state: str) -> str:
@@ -74,33 +98,11 @@ def validate_state_input(state: str) -> str:
     """
     state = state.strip()
 
-    # Try as uppercase code first
-    state_upper = state.upper()
-    if state_upper in STATE_MAPPING:
-        return state_upper
-
-    # Try as full name (case-insensitive)
-    state_title = state.title()
-    if state_title in NAME_TO_CODE:
-        return NAME_TO_CODE[state_title]
-
-    # Handle common variations
-    state_variations = {
-        'District Of Columbia': 'DC',
-        'Washington DC': 'DC',
-        'Washington D.C.': 'DC',
-        'D.C.': 'DC'
-    }
-
-    if state_title in state_variations:
-        return state_variations[state_title]
-
-    # If nothing matches, provide helpful error
-    valid_codes = ', '.join(sorted(STATE_MAPPING.keys()))
-    valid_names = ', '.join(sorted(STATE_MAPPING.values()))
-    raise ValueError(f"Invalid state '{state}'. Must be either:\n"
-                     f"- 2-letter code: {valid_codes}\n"
-                     f"- Full name: {valid_names}")
+    code = _STATE_LOOKUP.get(state.lower())
+    if code is None:
+        raise ValueError(f"Invalid state '{state}'. Must be either:\n"
+                         f"{_VALID_STATES_MESSAGE}")
+    return code
 
 
 def get_state_format(state_code: str, format_type: str) -> str:
@@ -1,16 +1,109 @@
 """Template substitution utilities."""
-from typing import Dict, Union, List, Any
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Union, List, Any, Tuple
+
+# Template variables look like {first_name}
+_VARIABLE_PATTERN = re.compile(r'\{(\w+)\}')
+
+
+@dataclass(frozen=True)
+class CompiledString:
+    """Template string pre-split into literal parts and variable names.
+
+    literals always has one more element than names; rendering interleaves
+    them, so no searching or re-parsing happens per substitution.
+    """
+    literals: Tuple[str, ...]
+    names: Tuple[str, ...]
+
+    def render(self, user_data: Dict) -> str:
+        """Render the string, leaving unknown variables untouched.
+
+        Args:
+            user_data: Dictionary containing actual user data
+
+        Returns:
+            String with substituted values
+        """
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            parts.append(
+                str(user_data[name]) if name in user_data else f'{{{name}}}')
+            parts.append(literal)
+        return ''.join(parts)
+
+
+@dataclass(frozen=True)
+class StaticValue:
+    """Dict or list in a compiled template that contains no variables.
+
+    Substitution returns value itself rather than rebuilding it, so every
+    rendered payload shares it; callers must not mutate it.
+    """
+    value: Union[Dict, List]
+
+
+@lru_cache(maxsize=1024)
+def _compile_string(template: str) -> Union[CompiledString, str]:
+    """Compile a template string, returning it unchanged if it has no variables."""
+    pieces = _VARIABLE_PATTERN.split(template)
+    if len(pieces) == 1:
+        return template
+    return CompiledString(literals=tuple(pieces[0::2]),
+                          names=tuple(pieces[1::2]))
+
+
+def compile_template(
+        template: Union[Dict, List, str, Any]) -> Union[Dict, List, Any]:
+    """Pre-compile every template string in a data structure.
+
+    Args:
+        template: Data structure containing template variables like {first_name}
+
+    Returns:
+        Same structure with template strings replaced by CompiledString nodes
+        and nested dicts and lists without variables by StaticValue nodes,
+        ready to pass to substitute_template_variables
+    """
+    if isinstance(template, dict):
+        return {key: _compile_node(value) for key, value in template.items()}
+    elif isinstance(template, list):
+        return [_compile_node(item) for item in template]
+    elif isinstance(template, str):
+        return _compile_string(template)
+    else:
+        return template
+
+
+def _compile_node(template: Any) -> Any:
+    """Compile a nested template value, freezing it if it has no variables."""
+    compiled = compile_template(template)
+    if isinstance(template, (dict, list)) and _is_static(compiled):
+        return StaticValue(template)
+    return compiled
+
+
+def _is_static(compiled: Any) -> bool:
+    """Check whether a compiled template renders without any substitution."""
+    if isinstance(compiled, dict):
+        return all(_is_static(value) for value in compiled.values())
+    elif isinstance(compiled, list):
+        return all(_is_static(item) for item in compiled)
+    return not isinstance(compiled, CompiledString)
 
 
 def substitute_template_variables(
         template: Union[Dict, List, str,
                         Any], user_data: Dict) -> Union[Dict, List, str, Any]:
     """Recursively substitute template variables in a data structure.
-    
+
     Args:
-        template: Data structure containing template variables like {first_name}
+        template: Data structure containing template variables like {first_name},
+            either raw or pre-compiled with compile_template
         user_data: Dictionary containing actual user data
-        
+
     Returns:
         Data structure with substituted values
     """
@@ -23,11 +116,14 @@ def substitute_template_variables(
         return [
             substitute_template_variables(item, user_data) for item in template
         ]
+    elif isinstance(template, CompiledString):
+        return template.render(user_data)
+    elif isinstance(template, StaticValue):
+        return template.value
     elif isinstance(template, str):
-        # Replace template variables like {first_name} with actual values
-        result = template
-        for key, value in user_data.items():
-            result = result.replace(f'{{{key}}}', str(value))
-        return result
+        compiled = _compile_string(template)
+        if isinstance(compiled, CompiledString):
+            return compiled.render(user_data)
+        return compiled
     else:
         return template
@@ -4,22 +4,31 @@ from datetime import datetime
 
 def validate_date_of_birth(date_str: str) -> str:
     """Validate and format date of birth.
-    
+
+    The fixed MM/DD/YYYY format is split directly rather than parsed with
+    strptime, which interprets its format string on every call.
+
     Args:
         date_str: Date string in MM/DD/YYYY format
-        
+
     Returns:
         Formatted date string
-        
+
     Raises:
         ValueError: If date is invalid
     """
+    parts = date_str.split('/')
+    if (len(parts) != 3
+            or not all(part.isascii() and part.isdigit() for part in parts)
+            or len(parts[0]) > 2 or len(parts[1]) > 2 or len(parts[2]) != 4):
+        raise ValueError("Date must be in MM/DD/YYYY format")
+
+    month, day, year = (int(part) for part in parts)
     try:
-        date_obj = datetime.strptime(date_str, '%m/%d/%Y')
-        if date_obj > datetime.now():
-            raise ValueError("Date of birth cannot be in the future")
-        return date_obj.strftime('%m/%d/%Y')
-    except ValueError as e:
-        if "time data" in str(e):
-            raise ValueError("Date must be in MM/DD/YYYY format")
-        raise
\ No newline at end of file
+        date_obj = datetime(year, month, day)
+    except ValueError:
+        raise ValueError("Date must be in MM/DD/YYYY format")
+
+    if date_obj > datetime.now():
+        raise ValueError("Date of birth cannot be in the future")
+    return f"{month:02d}/{day:02d}/{year:04d}"